@@ -0,0 +1,67 @@
+"""Горячая перезагрузка вопросов при изменении JSON файлов.
+
+BankWatcher следит за папкой вопросов через QFileSystemWatcher и при
+изменении файла разбирает заново только его, обновляя индексы общего
+банка на месте. Окна игры получают сигнал changed(имя файла).
+"""
+import os
+
+from PyQt5.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+
+# Редакторы часто пишут файл в несколько приемов: ждем, пока запись утихнет
+DEBOUNCE_MS = 200
+
+# Наблюдатели, общие для всего процесса (папка -> BankWatcher)
+_watchers = {}
+
+
+class BankWatcher(QObject):
+    """Наблюдение за файлами банка вопросов"""
+    changed = pyqtSignal(str)
+
+    def __init__(self, bank, parent=None):
+        super().__init__(parent)
+        self.bank = bank
+        self._pending = set()
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._file_changed)
+        self._watcher.directoryChanged.connect(self._directory_changed)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(DEBOUNCE_MS)
+        self._timer.timeout.connect(self._reload_pending)
+
+        self._watcher.addPath(bank.questions_dir)
+        self._watch_files(bank.files)
+
+    def _watch_files(self, json_files):
+        paths = [os.path.join(self.bank.questions_dir, f) for f in json_files]
+        paths = [p for p in paths if os.path.exists(p) and p not in self._watcher.files()]
+        if paths:
+            self._watcher.addPaths(paths)
+
+    def _file_changed(self, path):
+        self._pending.add(os.path.basename(path))
+        self._timer.start()
+
+    def _directory_changed(self, path):
+        # Новые и удаленные файлы
+        current = {f for f in os.listdir(self.bank.questions_dir) if f.endswith('.json')}
+        self._pending.update(current.symmetric_difference(self.bank.files))
+        self._timer.start()
+
+    def _reload_pending(self):
+        pending, self._pending = self._pending, set()
+        # При сохранении через замену файла наблюдение за ним снимается
+        self._watch_files(pending)
+        for json_file in sorted(pending):
+            if self.bank.reload_file(json_file):
+                self.changed.emit(json_file)
+
+
+def watch_bank(bank):
+    """Общий наблюдатель для банка (создается один раз)"""
+    watcher = _watchers.get(bank.questions_dir)
+    if watcher is None:
+        watcher = _watchers[bank.questions_dir] = BankWatcher(bank)
+    return watcher
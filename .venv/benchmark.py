@@ -0,0 +1,421 @@
+"""Замеры производительности игры без окна (QT_QPA_PLATFORM=offscreen).
+
+Запуск:
+    python benchmark.py                                 замер, результат в benchmark.json
+    python benchmark.py --sizes 1000,100000 --baseline base.json
+                                                        замер и сравнение с базовым
+    python benchmark.py --compare base.json new.json    сравнение двух готовых замеров
+
+На синтетических банках (по умолчанию 1k/100k/1M вопросов) замеряются:
+загрузка банка без кэша и из кэша, QuizApp.load_questions целиком,
+set_difficulty_and_start (построение пула и повторный старт), а на
+каждом вопросе игры - show_question (первый и единственный показ вопроса),
+check_answer, time_out, переход next_question (вместе с показом следующего
+вопроса) и итоговый show_results. Для каждого замера записываются медиана
+(time_ms, по ней идет сравнение), p95, лучшее время и число запусков.
+
+Время меряется отдельно от памяти: tracemalloc замедляет Python в разы,
+поэтому пик выделений считается вторым проходом. Пик RSS процесса за весь
+прогон записывается один раз в meta и не сравнивается: по замерам он не
+делится. Сравнение отмечает регрессию, если значение выросло больше --threshold
+и больше порога шума; при регрессиях код выхода 1. Для замеров с разных
+машин время можно привести к их скорости по калибровочному циклу на
+чистом Python (--normalize). На шумных виртуальных машинах разброс
+коротких замеров доходит до десятков процентов - поднимайте --threshold.
+"""
+import gc
+import io
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tempfile
+import contextlib
+import statistics
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from PyQt5.QtCore import QT_VERSION_STR, QEvent, qInstallMessageHandler
+from PyQt5.QtWidgets import QApplication, QDialog, QMessageBox
+
+import main
+import bank_watcher
+import question_bank
+from question_bank import QuestionBank, DIFFICULTIES
+from import_questions import CATEGORIES, ShardWriter
+from telemetry import EventLog
+from telemetry_summary import percentile
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+DEFAULT_OUTPUT = "benchmark.json"
+
+# Порог регрессии и пороги шума (меньшие изменения не считаются)
+THRESHOLD = 0.25
+NOISE = {"time_ms": 0.5, "alloc_peak_kb": 64}
+
+# Быстрые замеры повторяются, пока не наберется столько времени
+MIN_MEASURE_MS = 300
+MAX_RUNS = 50
+
+
+@contextlib.contextmanager
+def quiet():
+    """Сообщения игры ("Загружено N вопросов" и т.п.) не выводим"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def report(message):
+    print(message, flush=True)
+
+
+def close_window(app, window):
+    """Удаление окна вместе с его банком до следующего замера"""
+    window.countdown.stop()
+    window.close()
+    window.deleteLater()
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+    gc.collect()
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux - килобайты, macOS - байты
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def calibrate(rounds=5):
+    """Время фиксированной работы на чистом Python (мс, лучшее из rounds)"""
+    times = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        words = {}
+        for i in range(100000):
+            words[f"слово {i % 5000}"] = words.get(f"слово {i % 5000}", 0) + i
+        sorted(words.items(), key=lambda item: item[1])
+        times.append((time.perf_counter() - started) * 1000)
+    return min(times)
+
+
+def make_bank(questions_dir, size, seed=0):
+    """Синтетический банк: файлы по 5000 вопросов, как после импорта"""
+    rng = random.Random(seed)
+    writer = ShardWriter(questions_dir, "bench")
+    for i in range(size):
+        count = rng.randint(2, 4)
+        item = {
+            "question": f"Синтетический вопрос номер {i}: сколько будет {i} + {count}?",
+            "options": [f"Вариант {i + k}" for k in range(count)],
+            "answer": rng.randrange(count),
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "difficulty": DIFFICULTIES[i % len(DIFFICULTIES)],
+        }
+        writer.write(item["difficulty"], json.dumps(item, ensure_ascii=False))
+    writer.close()
+
+
+class Benchmark:
+    def __init__(self, repeat=3, questions=100):
+        self.repeat = repeat
+        self.questions = questions
+        self.results = {}
+
+    def record(self, name, times, alloc_peak_kb=None):
+        """Медиана, p95 и лучшее из времен замера (мс)"""
+        times = sorted(times)
+        median = statistics.median(times)
+        self.results[name] = {
+            "time_ms": round(median, 4),
+            "p95_ms": round(percentile(times, 0.95), 4),
+            "min_ms": round(times[0], 4),
+            "samples": len(times),
+            "alloc_peak_kb": round(alloc_peak_kb, 1) if alloc_peak_kb is not None else None,
+        }
+        alloc = f", выделено до {alloc_peak_kb:.0f} КБ" if alloc_peak_kb is not None else ""
+        report(f"  {name:<44} {median:10.3f} мс (p95 {self.results[name]['p95_ms']:.3f}){alloc}")
+
+    def measure(self, name, func, setup=None):
+        """Времена запусков + пик выделений отдельным запуском.
+
+        Запусков не меньше repeat; быстрые замеры повторяются, пока суммарно
+        не займут MIN_MEASURE_MS (но не больше MAX_RUNS раз).
+        """
+        times = []
+        while len(times) < self.repeat or (sum(times) < MIN_MEASURE_MS and len(times) < MAX_RUNS):
+            if setup:
+                setup()
+            # Мусор прошлых замеров не должен собираться внутри этого
+            gc.collect()
+            with quiet():
+                started = time.perf_counter()
+                func()
+                times.append((time.perf_counter() - started) * 1000)
+        if setup:
+            setup()
+        with quiet():
+            tracemalloc.start()
+            func()
+            alloc_peak = tracemalloc.get_traced_memory()[1] / 1024
+            tracemalloc.stop()
+        self.record(name, times, alloc_peak)
+
+    def run_size(self, app, size):
+        with tempfile.TemporaryDirectory(prefix="quiz_bench_") as root:
+            questions_dir = os.path.join(root, "questions")
+            os.makedirs(questions_dir)
+            started = time.perf_counter()
+            make_bank(questions_dir, size)
+            report(f"Банк {size} вопросов создан за {time.perf_counter() - started:.1f} с")
+
+            cache_path = os.path.join(questions_dir, question_bank.CACHE_FILE)
+
+            def drop_cache():
+                if os.path.exists(cache_path):
+                    os.remove(cache_path)
+
+            def load_bank():
+                QuestionBank(questions_dir).load()
+
+            self.measure(f"load_questions.cold[{size}]", load_bank, setup=drop_cache)
+            self.measure(f"load_questions.cached[{size}]", load_bank)
+
+            cwd = os.getcwd()
+            os.chdir(root)
+            try:
+                window = self.run_window(app, size)
+            finally:
+                os.chdir(cwd)
+                # Наблюдатель не должен видеть удаление временной папки
+                bank_watcher._watchers.clear()
+                question_bank._shared_banks.clear()
+            close_window(app, window)
+
+    def run_window(self, app, size):
+        windows = []
+
+        def reset_shared():
+            # Каждое окно загружает банк заново; прежнее окно с его копией
+            # банка удаляем, иначе на 1M вопросов не хватит памяти
+            while windows:
+                close_window(app, windows.pop())
+            question_bank._shared_banks.clear()
+            bank_watcher._watchers.clear()
+
+        def open_window():
+            window = main.QuizApp(events=EventLog(os.devnull), game_length=self.questions)
+            window.loader.wait()
+            app.processEvents()  # сигнал loaded -> bank_loaded
+            windows.append(window)
+
+        self.measure(f"QuizApp.load_questions[{size}]", open_window, setup=reset_shared)
+        window = windows[-1]
+
+        self.measure(f"set_difficulty_and_start.first[{size}]",
+                     lambda: window.set_difficulty_and_start("all"),
+                     setup=lambda: window.selectors.clear())
+        self.measure(f"set_difficulty_and_start.repeat[{size}]",
+                     lambda: window.set_difficulty_and_start("all"))
+
+        self.measure_game(window, size)
+        return window
+
+    def play_game(self, window, traced):
+        """Одна игра: на каждом вопросе ответ или время вышло, переход.
+
+        Вопрос показывают сами set_difficulty_and_start и next_question, по
+        одному разу: show_question замеряется через обертку на окне, а время
+        next_question включает показ следующего вопроса. При подсчете
+        выделений вложенный show_question отдельно не считается.
+        """
+        samples = {}
+        nested = []
+
+        def timed(name, func, *args):
+            if traced:
+                if nested:
+                    func(*args)
+                    return
+                nested.append(name)
+                tracemalloc.reset_peak()
+                try:
+                    func(*args)
+                finally:
+                    nested.pop()
+                value = tracemalloc.get_traced_memory()[1] / 1024
+            else:
+                started = time.perf_counter()
+                func(*args)
+                value = (time.perf_counter() - started) * 1000
+            samples.setdefault(name, []).append(value)
+
+        show_question = window.show_question
+        window.show_question = lambda: timed("show_question", show_question)
+        try:
+            with quiet():
+                window.set_difficulty_and_start("all")
+                session = window.session
+                total = session.total
+                for n in range(total):
+                    question = session.question
+                    if n % 3 == 0:
+                        timed("check_answer", window.check_answer, question.answer)
+                    elif n % 3 == 1:
+                        timed("check_answer", window.check_answer,
+                              (question.answer + 1) % len(question.options))
+                    else:
+                        timed("time_out", window.time_out)
+                    # Последний переход показывает итоги
+                    timed("next_question" if n < total - 1 else "show_results",
+                          window.next_question)
+        finally:
+            del window.show_question
+        return samples
+
+    def measure_game(self, window, size):
+        """repeat игр: для каждого хода лучшая из медиан по играм"""
+        games = [self.play_game(window, traced=False) for _ in range(self.repeat)]
+        tracemalloc.start()
+        allocations = self.play_game(window, traced=True)
+        tracemalloc.stop()
+        for name in games[0]:
+            best = min((game[name] for game in games), key=statistics.median)
+            self.record(f"{name}[{size}]", best, max(allocations[name]))
+
+
+def run(args):
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    app = QApplication(sys.argv[:1])
+    # Предупреждения offscreen-платформы Qt на каждый show() не выводим
+    qInstallMessageHandler(lambda kind, context, message: None)
+    # Модальные окна не показываем: выбор уровня вызывается из кода
+    QMessageBox.information = lambda *a, **k: QMessageBox.Ok
+    QMessageBox.warning = lambda *a, **k: QMessageBox.Ok
+    QDialog.exec_ = lambda dialog: QDialog.Rejected
+
+    bench = Benchmark(repeat=args.repeat, questions=args.questions)
+    started = time.perf_counter()
+    # Калибровка между замерами: берем лучшее, как и для самих замеров
+    calibration = calibrate()
+    for size in sizes:
+        bench.run_size(app, size)
+        calibration = min(calibration, calibrate())
+    report(f"Калибровочный цикл: {calibration:.2f} мс")
+
+    result = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "qt": QT_VERSION_STR,
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "repeat": args.repeat,
+            "questions_per_game": args.questions,
+            "elapsed_sec": round(time.perf_counter() - started, 1),
+            "calibration_ms": round(calibration, 3),
+            "rss_peak_mb": peak_rss_mb(),
+        },
+        "results": bench.results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    report(f"Результаты записаны в {args.output}")
+    return result
+
+
+def compare(baseline, current, threshold=THRESHOLD, normalize=False, noise=None):
+    """Сравнение замеров: печать таблицы, список регрессий"""
+    regressions = []
+    noise = dict(NOISE, **(noise or {}))
+    # Время текущего замера в масштабе машины базового
+    scale = 1.0
+    base_calibration = baseline.get("meta", {}).get("calibration_ms")
+    calibration = current.get("meta", {}).get("calibration_ms")
+    if normalize and base_calibration and calibration:
+        scale = base_calibration / calibration
+        report(f"Скорость машины относительно базового замера: {1 / scale:.2f} "
+               f"(время приведено к базовому)")
+    report(f"{'замер':<44} {'метрика':<14} {'было':>12} {'стало':>12} {'изм.':>8}")
+    for name, entry in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        for metric, floor in noise.items():
+            before, after = base.get(metric), entry.get(metric)
+            if before is None or after is None:
+                continue
+            if metric == "time_ms":
+                after *= scale
+            change = (after - before) / before if before else 0.0
+            regressed = after > before * (1 + threshold) and after - before > floor
+            if regressed:
+                regressions.append((name, metric, before, after))
+            if regressed or metric == "time_ms":
+                mark = "  РЕГРЕССИЯ" if regressed else ""
+                report(f"{name:<44} {metric:<14} {before:>12.3f} {after:>12.3f} {change:>+7.0%}{mark}")
+    missing = sorted(set(baseline["results"]) - set(current["results"]))
+    if missing:
+        report(f"Нет в новом замере: {', '.join(missing)}")
+    return regressions
+
+
+def load_result(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Ошибка чтения {path}: {e}")
+        sys.exit(2)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры производительности викторины")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="размеры синтетических банков через запятую")
+    parser.add_argument("--questions", type=int, default=100, help="вопросов в замеряемой игре")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="повторов загрузки и старта (берется лучшее время)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=None,
+                        help="сравнить результат с сохраненным замером")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="только сравнить два готовых замера")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="допустимый рост (0.25 = 25%%)")
+    parser.add_argument("--min-ms", type=float, default=NOISE["time_ms"],
+                        help="рост времени меньше этого (мс) не считается регрессией")
+    parser.add_argument("--normalize", action="store_true",
+                        help="привести время к скорости машины (замеры с разных машин)")
+    return parser.parse_args(argv)
+
+
+def main_benchmark(argv=None):
+    args = parse_args(argv)
+    if args.compare:
+        baseline, current = (load_result(path) for path in args.compare)
+    else:
+        baseline = load_result(args.baseline) if args.baseline else None
+        current = run(args)
+        if baseline is None:
+            return
+
+    regressions = compare(baseline, current, args.threshold, normalize=args.normalize,
+                          noise={"time_ms": args.min_ms})
+    if regressions:
+        report(f"Регрессий: {len(regressions)} (порог {args.threshold:.0%})")
+        sys.exit(1)
+    report("Регрессий нет")
+
+
+if __name__ == '__main__':
+    main_benchmark()
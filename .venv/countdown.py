@@ -0,0 +1,90 @@
+"""Обратный отсчет времени на ответ по монотонным часам.
+
+Один Countdown живет все время игры и перезапускается на каждый вопрос.
+Оставшееся время считается от момента старта по time.monotonic(), поэтому
+задержки цикла событий не накапливаются, как при уменьшении счетчика на
+каждое срабатывание таймера.
+"""
+import math
+import time
+
+from PyQt5.QtCore import Qt, QObject, QTimer, pyqtSignal
+
+# Как часто обновлять оставшееся время (мс)
+TICK_INTERVAL_MS = 100
+
+
+class Countdown(QObject):
+    """Обратный отсчет с сигналами tick(осталось секунд) и expired()"""
+    tick = pyqtSignal(float)
+    expired = pyqtSignal()
+
+    def __init__(self, interval_ms=TICK_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self.started = None
+        self.deadline = None
+        self.paused_at = None
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def start(self, seconds):
+        """Запуск отсчета на seconds секунд (можно дробное значение)"""
+        self.started = time.monotonic()
+        self.deadline = self.started + seconds
+        self.paused_at = None
+        self.tick.emit(float(seconds))
+        self._schedule(seconds)
+
+    def stop(self):
+        self._timer.stop()
+        self.deadline = None
+        self.paused_at = None
+
+    def pause(self):
+        """Приостановка отсчета (например, на время модального окна)"""
+        if self.deadline is None or self.paused_at is not None:
+            return
+        self._timer.stop()
+        self.paused_at = time.monotonic()
+
+    def resume(self):
+        """Продолжение отсчета: время паузы не засчитывается"""
+        if self.paused_at is None:
+            return
+        paused = time.monotonic() - self.paused_at
+        self.paused_at = None
+        self.started += paused
+        self.deadline += paused
+        self._schedule(self.remaining())
+
+    def isActive(self):
+        return self.deadline is not None
+
+    def remaining(self):
+        if self.deadline is None:
+            return 0.0
+        return max(0.0, self.deadline - time.monotonic())
+
+    def elapsed_ms(self):
+        """Сколько прошло с начала отсчета (мс)"""
+        if self.started is None:
+            return 0.0
+        return (time.monotonic() - self.started) * 1000
+
+    def _schedule(self, remaining):
+        # Следующее срабатывание не позже окончания времени
+        self._timer.start(max(0, min(self.interval_ms, math.ceil(remaining * 1000))))
+
+    def _on_timeout(self):
+        if self.deadline is None:
+            return
+        remaining = self.remaining()
+        if remaining <= 0:
+            self.deadline = None
+            self.expired.emit()
+            return
+        self.tick.emit(remaining)
+        self._schedule(remaining)
@@ -0,0 +1,305 @@
+import os
+
+from import_questions import validate_record, write_json_array
+
+# Создаем папку если её нет
+questions_dir = "questions"
+os.makedirs(questions_dir, exist_ok=True)
+
+# Все вопросы
+all_questions = {
+    "easy_questions.json": [
+        {
+            "question": "Какой язык программирования считается змеиным?",
+            "options": ["JavaScript", "Python", "Java", "C++"],
+            "answer": 1,
+            "category": "Программирование",
+            "difficulty": "easy"
+        },
+        {
+            "question": "Сколько бит в одном байте?",
+            "options": ["4", "8", "16", "32"],
+            "answer": 1,
+            "category": "Компьютеры",
+            "difficulty": "easy"
+        },
+        {
+            "question": "Столица Франции?",
+            "options": ["Лондон", "Берлин", "Париж", "Мадрид"],
+            "answer": 2,
+            "category": "География",
+            "difficulty": "easy"
+        },
+        {
+            "question": "Как называется самая большая планета Солнечной системы?",
+            "options": ["Земля", "Марс", "Юпитер", "Сатурн"],
+            "answer": 2,
+            "category": "Астрономия",
+            "difficulty": "easy"
+        },
+        {
+            "question": "Сколько дней в високосном году?",
+            "options": ["365", "366", "364", "367"],
+            "answer": 1,
+            "category": "Календарь",
+            "difficulty": "easy"
+        },
+        {
+            "question": "Какой газ преобладает в атмосфере Земли?",
+            "options": ["Кислород", "Углекислый газ", "Азот", "Водород"],
+            "answer": 2,
+            "category": "Химия",
+            "difficulty": "easy"
+        },
+        {
+            "question": "Кто написал 'Евгения Онегина'?",
+            "options": ["Достоевский", "Пушкин", "Толстой", "Чехов"],
+            "answer": 1,
+            "category": "Литература",
+            "difficulty": "easy"
+        },
+        {
+            "question": "Сколько сторон у квадрата?",
+            "options": ["3", "4", "5", "6"],
+            "answer": 1,
+            "category": "Математика",
+            "difficulty": "easy"
+        },
+        {
+            "question": "Какой цвет получается при смешении синего и желтого?",
+            "options": ["Фиолетовый", "Оранжевый", "Зеленый", "Красный"],
+            "answer": 2,
+            "category": "Искусство",
+            "difficulty": "easy"
+        },
+        {
+            "question": "Какое животное является символом России?",
+            "options": ["Волк", "Орел", "Медведь", "Тигр"],
+            "answer": 2,
+            "category": "Общие знания",
+            "difficulty": "easy"
+        }
+    ],
+
+    "medium_questions.json": [
+        {
+            "question": "Что означает аббревиатура HTTP?",
+            "options": [
+                "Hyper Text Transfer Protocol",
+                "High Tech Transfer Process",
+                "Hyper Transfer Text Protocol",
+                "Home Tool Transfer Protocol"
+            ],
+            "answer": 0,
+            "category": "Интернет",
+            "difficulty": "medium"
+        },
+        {
+            "question": "Сколько элементов в современной периодической таблице Менделеева?",
+            "options": ["92", "118", "126", "138"],
+            "answer": 1,
+            "category": "Химия",
+            "difficulty": "medium"
+        },
+        {
+            "question": "Кто открыл закон всемирного тяготения?",
+            "options": ["Эйнштейн", "Ньютон", "Галилей", "Коперник"],
+            "answer": 1,
+            "category": "Физика",
+            "difficulty": "medium"
+        },
+        {
+            "question": "В каком году человек впервые полетел в космос?",
+            "options": ["1957", "1961", "1969", "1975"],
+            "answer": 1,
+            "category": "История",
+            "difficulty": "medium"
+        },
+        {
+            "question": "Какой океан самый большой по площади?",
+            "options": ["Атлантический", "Индийский", "Северный Ледовитый", "Тихий"],
+            "answer": 3,
+            "category": "География",
+            "difficulty": "medium"
+        },
+        {
+            "question": "Как называется самая высокая гора в мире?",
+            "options": ["Килиманджаро", "Эверест", "Мак-Кинли", "Аконкагуа"],
+            "answer": 1,
+            "category": "География",
+            "difficulty": "medium"
+        },
+        {
+            "question": "Кто написал роман 'Преступление и наказание'?",
+            "options": ["Толстой", "Достоевский", "Чехов", "Гоголь"],
+            "answer": 1,
+            "category": "Литература",
+            "difficulty": "medium"
+        },
+        {
+            "question": "Сколько клавиш у стандартного пианино?",
+            "options": ["66", "78", "88", "92"],
+            "answer": 2,
+            "category": "Музыка",
+            "difficulty": "medium"
+        },
+        {
+            "question": "Какой химический элемент обозначается символом 'Au'?",
+            "options": ["Серебро", "Железо", "Золото", "Алюминий"],
+            "answer": 2,
+            "category": "Химия",
+            "difficulty": "medium"
+        },
+        {
+            "question": "В каком году началась Вторая мировая война?",
+            "options": ["1939", "1941", "1945", "1914"],
+            "answer": 0,
+            "category": "История",
+            "difficulty": "medium"
+        }
+    ],
+
+    "hard_questions.json": [
+        {
+            "question": "Какой алгоритм сортировки имеет временную сложность O(n log n) в худшем случае?",
+            "options": ["Пузырьковая сортировка", "Быстрая сортировка", "Сортировка слиянием", "Сортировка вставками"],
+            "answer": 2,
+            "category": "Алгоритмы",
+            "difficulty": "hard"
+        },
+        {
+            "question": "Кто сформулировал теорию относительности?",
+            "options": ["Исаак Ньютон", "Альберт Эйнштейн", "Никола Тесла", "Стивен Хокинг"],
+            "answer": 1,
+            "category": "Физика",
+            "difficulty": "hard"
+        },
+        {
+            "question": "Сколько спутников у Юпитера?",
+            "options": ["12", "53", "79", "Более 90"],
+            "answer": 3,
+            "category": "Астрономия",
+            "difficulty": "hard"
+        },
+        {
+            "question": "Какой элемент является самым тяжелым из встречающихся в природе?",
+            "options": ["Уран", "Плутоний", "Торий", "Нептуний"],
+            "answer": 0,
+            "category": "Химия",
+            "difficulty": "hard"
+        },
+        {
+            "question": "Что такое 'Парадокс Ферми'?",
+            "options": [
+                "Парадокс о скорости света",
+                "Парадокс о существовании внеземных цивилизаций",
+                "Парадокс квантовой механики",
+                "Парадокс теории вероятности"
+            ],
+            "answer": 1,
+            "category": "Наука",
+            "difficulty": "hard"
+        },
+        {
+            "question": "Кто доказал Великую теорему Ферма?",
+            "options": ["Андрей Виноградов", "Григорий Перельман", "Эндрю Уайлс", "Теренс Тао"],
+            "answer": 2,
+            "category": "Математика",
+            "difficulty": "hard"
+        },
+        {
+            "question": "Как называется самая глубокая точка мирового океана?",
+            "options": ["Желоб Тонга", "Филиппинский желоб", "Марианская впадина", "Желоб Кермадек"],
+            "answer": 2,
+            "category": "География",
+            "difficulty": "hard"
+        },
+        {
+            "question": "Сколько хромосом у обычной домашней мушки дрозофилы?",
+            "options": ["4", "6", "8", "10"],
+            "answer": 2,
+            "category": "Генетика",
+            "difficulty": "hard"
+        },
+        {
+            "question": "Кто является автором философского труда 'Так говорил Заратустра'?",
+            "options": ["Фридрих Ницше", "Артур Шопенгауэр", "Иммануил Кант", "Сократ"],
+            "answer": 0,
+            "category": "Философия",
+            "difficulty": "hard"
+        },
+        {
+            "question": "Какой год считается началом Византийской империи?",
+            "options": ["330 год", "476 год", "527 год", "1054 год"],
+            "answer": 0,
+            "category": "История",
+            "difficulty": "hard"
+        }
+    ],
+
+    "mixed_questions.json": [
+        {
+            "question": "Как называется операционная система с пингвином-талисманом?",
+            "options": ["Windows", "macOS", "Linux", "Android"],
+            "answer": 2,
+            "category": "Компьютеры",
+            "difficulty": "easy"
+        },
+        {
+            "question": "Что такое API?",
+            "options": [
+                "Application Programming Interface",
+                "Advanced Program Integration",
+                "Automated Process Interface",
+                "Application Process Integration"
+            ],
+            "answer": 0,
+            "category": "Программирование",
+            "difficulty": "medium"
+        },
+        {
+            "question": "Какой алгоритм используется в блокчейне Bitcoin для достижения консенсуса?",
+            "options": ["Proof of Stake", "Proof of Work", "Proof of Authority", "Proof of History"],
+            "answer": 1,
+            "category": "Криптография",
+            "difficulty": "hard"
+        },
+        {
+            "question": "Сколько планет в Солнечной системе?",
+            "options": ["7", "8", "9", "10"],
+            "answer": 1,
+            "category": "Астрономия",
+            "difficulty": "easy"
+        },
+        {
+            "question": "Как называется явление, когда луна полностью закрывает солнце?",
+            "options": ["Лунное затмение", "Солнечное затмение", "Апогей", "Перигей"],
+            "answer": 1,
+            "category": "Астрономия",
+            "difficulty": "medium"
+        }
+    ]
+}
+
+print("Создаю файлы с вопросами...")
+print("=" * 50)
+
+for filename, questions in all_questions.items():
+    # Те же проверки, что и при импорте (python import_questions.py import ...)
+    questions = [validate_record(q, categories=None) for q in questions]
+    filepath = os.path.join(questions_dir, filename)
+    write_json_array(filepath, questions)
+
+    print(f"✓ Создан: {filename}")
+    print(f"  Количество вопросов: {len(questions)}")
+    print(f"  Уровни: {set(q['difficulty'] for q in questions)}")
+    print()
+
+print("=" * 50)
+print("✅ Все файлы созданы успешно!")
+print("\nТеперь у вас есть:")
+print("• 10 простых вопросов (easy_questions.json)")
+print("• 10 средних вопросов (medium_questions.json)")
+print("• 10 сложных вопросов (hard_questions.json)")
+print("• 5 смешанных вопросов (mixed_questions.json)")
+print("\nИтого: 35 вопросов разных уровней сложности! 🎯")
\ No newline at end of file
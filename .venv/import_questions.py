@@ -0,0 +1,513 @@
+"""Потоковый импорт и экспорт вопросов (CSV / JSON Lines).
+
+Импорт читает файлы по частям и проверяет записи в пуле процессов:
+ответ должен быть среди вариантов, вариантов 2-4, сложность и категория -
+из известных. Дубликаты (по нормализованному тексту вопроса, в том числе
+уже лежащие в папке вопросов) отбрасываются, результат пишется частями
+по --shard-size вопросов в JSON файлы, которые читает QuestionBank.
+
+Память не зависит от размера входа: в работе одновременно несколько пачек
+записей, а дубликаты ищутся по временным корзинам, разбитым по хэшу.
+
+Записанные файлы перечисляются в .import_manifest в папке вопросов.
+Повторный импорт с тем же префиксом заменяет только их, а префикс, под
+который попадают файлы, написанные не импортом, не принимается.
+
+Примеры:
+    python import_questions.py import bank.csv extra.jsonl --prefix imported
+    python import_questions.py export bank.jsonl
+"""
+import os
+import re
+import csv
+import sys
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+from collections import deque
+from multiprocessing import Pool
+
+from question_bank import DIFFICULTIES, DEFAULT_DIFFICULTY
+
+# Записей в одной задаче для процесса
+BATCH_SIZE = 5000
+
+# Сколько пачек держать в работе на каждый процесс
+BATCHES_IN_FLIGHT = 2
+
+# Корзин для поиска дубликатов (в памяти одновременно одна корзина)
+BUCKETS = 64
+
+SHARD_SIZE = 5000
+MIN_OPTIONS = 2
+MAX_OPTIONS = 4
+DEFAULT_CATEGORY = "Общие знания"
+
+# Категории, которые уже есть в игре; дополняются через --categories
+CATEGORIES = (
+    "Алгоритмы", "Астрономия", "География", "Генетика", "Интернет",
+    "Искусство", "История", "Календарь", "Компьютеры", "Криптография",
+    "Литература", "Математика", "Музыка", "Наука", "Общие знания",
+    "Программирование", "Физика", "Философия", "Химия",
+)
+
+# Сложность в таблицах часто пишут по-русски
+DIFFICULTY_ALIASES = {
+    "простой": "easy", "легкий": "easy", "лёгкий": "easy",
+    "средний": "medium",
+    "сложный": "hard", "трудный": "hard",
+}
+
+# Файлы, записанные импортом: префикс -> имена файлов
+MANIFEST_FILE = ".import_manifest"
+
+INPUT_FORMATS = (".csv", ".jsonl", ".ndjson")
+CSV_FIELDS = ("question", "option1", "option2", "option3", "option4",
+              "answer", "category", "difficulty")
+
+_worker = {}
+
+
+class ValidationError(ValueError):
+    """Запись не проходит проверку"""
+
+
+def normalize_text(text):
+    """Текст вопроса без регистра, пунктуации и лишних пробелов"""
+    return " ".join(re.findall(r"\w+", text.casefold().replace("ё", "е")))
+
+
+def text_hash(text):
+    return hashlib.blake2b(normalize_text(text).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _options_from(record):
+    options = record.get("options")
+    if options is None:
+        # CSV: option1..option4, пустые ячейки пропускаем
+        options = [record.get(f"option{i}") for i in range(1, MAX_OPTIONS + 1)]
+        options = [o for o in options if o not in (None, "")]
+    elif isinstance(options, str):
+        options = [o for o in options.split("|") if o.strip()]
+    if not isinstance(options, list):
+        raise ValidationError("options должен быть списком")
+    return [str(o).strip() for o in options]
+
+
+def _answer_index(answer, options):
+    """Индекс ответа: число (как в JSON), буква A-D или текст варианта.
+
+    Текст варианта важнее номера: в таблицах ответ часто хранится текстом,
+    а варианты бывают числами. Если строка - и вариант, и номер другого
+    варианта, ответ неоднозначен.
+    """
+    if isinstance(answer, bool) or answer is None or answer == "":
+        raise ValidationError("нет ответа")
+    if isinstance(answer, int):
+        index = answer
+    else:
+        answer = str(answer).strip()
+        if answer.lstrip("-").isdigit():
+            index = int(answer)
+        elif len(answer) == 1 and answer.upper() in "ABCD":
+            index = "ABCD".index(answer.upper())
+        else:
+            index = None
+        if answer in options:
+            if index is not None and 0 <= index < len(options) and options[index] != answer:
+                raise ValidationError(f"ответ '{answer}' неоднозначен: это и вариант, "
+                                      f"и номер варианта '{options[index]}'")
+            index = options.index(answer)
+        elif index is None:
+            raise ValidationError(f"ответ '{answer}' не найден среди вариантов")
+    if not 0 <= index < len(options):
+        raise ValidationError(f"ответ {index} вне вариантов (0-{len(options) - 1})")
+    return index
+
+
+def validate_record(record, categories=CATEGORIES):
+    """Проверка и приведение записи к формату файлов вопросов.
+
+    categories=None - любая категория допустима.
+    """
+    if not isinstance(record, dict):
+        raise ValidationError("запись должна быть объектом")
+    question = str(record.get("question") or "").strip()
+    if not question:
+        raise ValidationError("пустой вопрос")
+
+    options = _options_from(record)
+    if not MIN_OPTIONS <= len(options) <= MAX_OPTIONS:
+        raise ValidationError(f"вариантов {len(options)}, нужно {MIN_OPTIONS}-{MAX_OPTIONS}")
+    if not all(options):
+        raise ValidationError("пустой вариант ответа")
+    if len(set(options)) != len(options):
+        raise ValidationError("повторяющиеся варианты ответа")
+    answer = _answer_index(record.get("answer"), options)
+
+    difficulty = str(record.get("difficulty") or DEFAULT_DIFFICULTY).strip().lower()
+    difficulty = DIFFICULTY_ALIASES.get(difficulty, difficulty)
+    if difficulty not in DIFFICULTIES:
+        raise ValidationError(f"неизвестная сложность '{difficulty}'")
+
+    category = str(record.get("category") or DEFAULT_CATEGORY).strip()
+    if categories is not None and category not in categories:
+        raise ValidationError(f"неизвестная категория '{category}'")
+
+    return {"question": question, "options": options, "answer": answer,
+            "category": category, "difficulty": difficulty}
+
+
+def _init_worker(categories):
+    _worker["categories"] = categories
+
+
+def validate_batch(batch):
+    """Проверка пачки записей в процессе пула.
+
+    batch - список (номер строки, запись или строка JSON). Возвращает
+    корректные записи как (хэш, сложность, JSON) и ошибки (номер строки, текст).
+    """
+    categories = _worker.get("categories", CATEGORIES)
+    valid = []
+    errors = []
+    for line_no, raw in batch:
+        try:
+            record = json.loads(raw) if isinstance(raw, str) else raw
+            item = validate_record(record, categories)
+        except (ValidationError, json.JSONDecodeError) as e:
+            errors.append((line_no, str(e)))
+            continue
+        valid.append((text_hash(item["question"]), item["difficulty"],
+                      json.dumps(item, ensure_ascii=False)))
+    return valid, errors
+
+
+def read_records(path, delimiter=None):
+    """Записи файла по одной: (номер строки, запись). Формат по расширению."""
+    if path.endswith((".jsonl", ".ndjson")):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if line.strip():
+                    yield line_no, line  # разбор JSON - в процессах пула
+    elif path.endswith(".csv"):
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            if delimiter is None:
+                sample = f.read(65536)
+                f.seek(0)
+                try:
+                    delimiter = csv.Sniffer().sniff(sample, delimiters=",;\t").delimiter
+                except csv.Error:
+                    delimiter = ","
+            reader = csv.DictReader(f, delimiter=delimiter)
+            for row in reader:
+                yield reader.line_num, row
+    else:
+        raise ValueError(f"неизвестный формат файла {path} (нужен .csv или .jsonl)")
+
+
+def batches(paths, delimiter=None, size=BATCH_SIZE):
+    """Пачки записей из всех входных файлов с указанием источника"""
+    for path in paths:
+        batch = []
+        for line_no, raw in read_records(path, delimiter):
+            batch.append((line_no, raw))
+            if len(batch) >= size:
+                yield path, batch
+                batch = []
+        if batch:
+            yield path, batch
+
+
+def validate_stream(pool, paths, delimiter=None, in_flight=BATCHES_IN_FLIGHT):
+    """Результаты проверки пачек по порядку; в работе не больше in_flight пачек.
+
+    Pool.imap сам вычитывает весь вход в очередь задач, поэтому пачки
+    отправляются вручную по мере получения результатов.
+    """
+    pending = deque()
+    for path, batch in batches(paths, delimiter):
+        pending.append((path, len(batch), pool.apply_async(validate_batch, (batch,))))
+        if len(pending) >= in_flight:
+            path_done, count, result = pending.popleft()
+            yield path_done, count, result.get()
+    while pending:
+        path_done, count, result = pending.popleft()
+        yield path_done, count, result.get()
+
+
+class ShardWriter:
+    """Запись вопросов в JSON файлы частями по shard_size (свой поток на уровень)"""
+
+    def __init__(self, output_dir, prefix, shard_size=SHARD_SIZE):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.shard_size = shard_size
+        self.files = []
+        self._open = {}  # сложность -> [файл, путь, записано]
+        self._numbers = dict.fromkeys(DIFFICULTIES, 0)
+
+    def write(self, difficulty, item_json):
+        shard = self._open.get(difficulty)
+        if shard is None:
+            self._numbers[difficulty] += 1
+            name = f"{self.prefix}_{difficulty}_{self._numbers[difficulty]:04d}.json"
+            path = os.path.join(self.output_dir, name)
+            # Пишем во временный файл: игра с горячей перезагрузкой не увидит
+            # недописанный JSON
+            shard = self._open[difficulty] = [open(path + ".tmp", 'w', encoding='utf-8'), path, 0]
+            shard[0].write("[\n")
+        f, path, count = shard
+        f.write(("  " if count == 0 else ",\n  ") + item_json)
+        shard[2] += 1
+        if shard[2] >= self.shard_size:
+            self._finish(difficulty)
+
+    def _finish(self, difficulty):
+        f, path, count = self._open.pop(difficulty)
+        f.write("\n]\n")
+        f.close()
+        os.replace(path + ".tmp", path)
+        self.files.append((os.path.basename(path), count))
+
+    def close(self):
+        for difficulty in list(self._open):
+            self._finish(difficulty)
+
+
+def write_json_array(path, items):
+    """JSON файл вопросов: по записи на строку (компактнее indent=2)"""
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        f.write("[\n" + ",\n".join("  " + json.dumps(item, ensure_ascii=False)
+                                   for item in items) + "\n]\n")
+    os.replace(path + ".tmp", path)
+
+
+def read_manifest(questions_dir):
+    """Файлы прошлых импортов: префикс -> [имя файла]"""
+    try:
+        with open(os.path.join(questions_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if not isinstance(manifest, dict):
+        raise ValueError(f"{MANIFEST_FILE}: ожидался объект JSON")
+    return manifest
+
+
+def write_manifest(questions_dir, manifest):
+    path = os.path.join(questions_dir, MANIFEST_FILE)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def foreign_files(questions_dir, prefix, own_files):
+    """Файлы под префиксом, которые записал не импорт с этим префиксом"""
+    return sorted(f for f in os.listdir(questions_dir)
+                  if f.startswith(prefix + "_") and f.endswith('.json') and f not in own_files)
+
+
+def existing_questions(questions_dir, skip_files=()):
+    """Тексты вопросов из папки (кроме skip_files - прошлого импорта, который заменяется)"""
+    if not os.path.isdir(questions_dir):
+        return
+    for json_file in sorted(os.listdir(questions_dir)):
+        if not json_file.endswith('.json') or json_file in skip_files:
+            continue
+        try:
+            with open(os.path.join(questions_dir, json_file), 'r', encoding='utf-8') as f:
+                items = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Пропущен {json_file}: {e}")
+            continue
+        for item in items:
+            if isinstance(item, dict) and item.get("question"):
+                yield item["question"]
+
+
+def run_import(args):
+    for path in args.inputs:
+        if not os.path.exists(path):
+            print(f"Ошибка: файл '{path}' не найден")
+            sys.exit(1)
+        if not path.endswith(INPUT_FORMATS):
+            print(f"Ошибка: неизвестный формат файла '{path}' (нужен .csv или .jsonl)")
+            sys.exit(1)
+
+    categories = None
+    if not args.any_category:
+        categories = set(CATEGORIES)
+        if args.categories:
+            categories.update(c.strip() for c in args.categories.split(",") if c.strip())
+        categories = frozenset(categories)
+
+    os.makedirs(args.output, exist_ok=True)
+    try:
+        manifest = read_manifest(args.output)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}")
+        sys.exit(1)
+    old_files = set(manifest.get(args.prefix, ()))
+    foreign = foreign_files(args.output, args.prefix, old_files)
+    if foreign:
+        print(f"Ошибка: префикс '{args.prefix}' совпадает с файлами, которые записал "
+              f"не импорт: {', '.join(foreign)}. Выберите другой --prefix")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    total = invalid = duplicates = checked_batches = 0
+    shown_errors = 0
+    errors_file = open(args.errors, 'w', encoding='utf-8') if args.errors else None
+
+    with tempfile.TemporaryDirectory(prefix="import_questions_") as tmp_dir:
+        buckets = [open(os.path.join(tmp_dir, f"{i:02d}.txt"), 'w', encoding='utf-8')
+                   for i in range(BUCKETS)]
+
+        # Вопросы, которые уже есть в игре, тоже считаются дубликатами
+        if not args.keep_duplicates:
+            for question in existing_questions(args.output, old_files):
+                digest = text_hash(question)
+                buckets[int(digest, 16) % BUCKETS].write(f"{digest}\t\t\n")
+
+        # 1. Проверка в пуле процессов, корректные записи - по корзинам хэша
+        with Pool(args.processes, initializer=_init_worker, initargs=(categories,)) as pool:
+            stream = validate_stream(pool, args.inputs, args.delimiter,
+                                     in_flight=args.processes * BATCHES_IN_FLIGHT)
+            for path, count, (valid, errors) in stream:
+                total += count
+                invalid += len(errors)
+                for line_no, message in errors:
+                    if errors_file:
+                        errors_file.write(f"{path}:{line_no}: {message}\n")
+                    if shown_errors < args.show_errors:
+                        print(f"  {path}:{line_no}: {message}")
+                        shown_errors += 1
+                for digest, difficulty, item_json in valid:
+                    buckets[int(digest, 16) % BUCKETS].write(f"{digest}\t{difficulty}\t{item_json}\n")
+                checked_batches += 1
+                if checked_batches % 20 == 0:
+                    print(f"Проверено записей: {total}")
+        for bucket in buckets:
+            bucket.close()
+        if errors_file:
+            errors_file.close()
+
+        # 2. Дубликаты ищутся внутри корзины, порядок записей в ней сохранен
+        writer = ShardWriter(args.output, args.prefix, args.shard_size)
+        for i in range(BUCKETS):
+            seen = set()
+            with open(os.path.join(tmp_dir, f"{i:02d}.txt"), 'r', encoding='utf-8') as f:
+                for line in f:
+                    digest, difficulty, item_json = line.rstrip("\n").split("\t", 2)
+                    if digest in seen and not args.keep_duplicates:
+                        # Повторы среди вопросов игры (без JSON) не считаем
+                        if item_json:
+                            duplicates += 1
+                        continue
+                    seen.add(digest)
+                    if item_json:
+                        writer.write(difficulty, item_json)
+        writer.close()
+
+    # Старые файлы префикса удаляются только после записи новых. В манифест
+    # сначала попадают и те, и другие: прерванный импорт не оставит файлов,
+    # о которых импорт не знает
+    new_files = [name for name, _ in writer.files]
+    manifest[args.prefix] = sorted(old_files | set(new_files))
+    write_manifest(args.output, manifest)
+    for json_file in sorted(old_files - set(new_files)):
+        try:
+            os.remove(os.path.join(args.output, json_file))
+        except FileNotFoundError:
+            pass
+    if new_files:
+        manifest[args.prefix] = new_files
+    else:
+        del manifest[args.prefix]
+    write_manifest(args.output, manifest)
+
+    written = sum(count for _, count in writer.files)
+    elapsed = time.perf_counter() - started
+    print(f"Записей: {total}, с ошибками: {invalid}, дубликатов: {duplicates}, "
+          f"импортировано: {written} ({elapsed:.1f} с)")
+    print(f"Файлов в {args.output}: {len(writer.files)} ({args.prefix}_<уровень>_NNNN.json)")
+    if invalid and args.errors:
+        print(f"Ошибки записаны в {args.errors}")
+
+
+def run_export(args):
+    """Выгрузка всех вопросов из папки в CSV или JSON Lines, по файлу за раз"""
+    if not os.path.isdir(args.questions_dir):
+        print(f"Ошибка: директория '{args.questions_dir}' не найдена!")
+        sys.exit(1)
+
+    is_csv = args.output.endswith(".csv")
+    exported = 0
+    with open(args.output, 'w', encoding='utf-8', newline='') as out:
+        writer = csv.writer(out) if is_csv else None
+        if writer:
+            writer.writerow(CSV_FIELDS)
+        for json_file in sorted(os.listdir(args.questions_dir)):
+            if not json_file.endswith('.json'):
+                continue
+            with open(os.path.join(args.questions_dir, json_file), 'r', encoding='utf-8') as f:
+                items = json.load(f)
+            category_name = json_file.replace('.json', '').capitalize()
+            for item in items:
+                item = dict(item)
+                item.setdefault("category", category_name)
+                item.setdefault("difficulty", DEFAULT_DIFFICULTY)
+                if writer:
+                    options = list(item["options"]) + [""] * (MAX_OPTIONS - len(item["options"]))
+                    writer.writerow([item["question"], *options[:MAX_OPTIONS], item["answer"],
+                                     item["category"], item["difficulty"]])
+                else:
+                    out.write(json.dumps(item, ensure_ascii=False) + "\n")
+                exported += 1
+    print(f"Выгружено {exported} вопросов в {args.output}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Импорт и экспорт вопросов викторины")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    imp = commands.add_parser("import", help="проверить CSV/JSONL и записать файлы вопросов")
+    imp.add_argument("inputs", nargs="+", help="файлы .csv или .jsonl")
+    imp.add_argument("--output", default="questions", help="папка вопросов игры")
+    imp.add_argument("--prefix", default="imported",
+                     help="префикс файлов (файлы прошлого импорта с ним заменяются, "
+                          "чужие файлы с ним - ошибка)")
+    imp.add_argument("--shard-size", type=int, default=SHARD_SIZE,
+                     help="вопросов в одном файле")
+    imp.add_argument("--categories", default="",
+                     help="дополнительные допустимые категории через запятую")
+    imp.add_argument("--any-category", action="store_true",
+                     help="не проверять категорию")
+    imp.add_argument("--keep-duplicates", action="store_true",
+                     help="не отбрасывать повторяющиеся вопросы")
+    imp.add_argument("--delimiter", default=None,
+                     help="разделитель CSV (по умолчанию определяется сам)")
+    imp.add_argument("--errors", default=None, help="файл для списка всех ошибок")
+    imp.add_argument("--show-errors", type=int, default=20,
+                     help="сколько ошибок вывести на экран")
+    imp.add_argument("--processes", type=int, default=os.cpu_count())
+
+    exp = commands.add_parser("export", help="выгрузить вопросы в CSV или JSONL")
+    exp.add_argument("output", help="файл .csv или .jsonl")
+    exp.add_argument("--questions-dir", default="questions")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "import":
+        run_import(args)
+    else:
+        run_export(args)
+
+
+if __name__ == '__main__':
+    main()
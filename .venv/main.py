@@ -0,0 +1,851 @@
+import sys
+import math
+import time
+
+# Момент старта для --profile-startup
+STARTED = time.perf_counter()
+
+import atexit
+import argparse
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QDialog, QWidget, QLabel,
+                             QPushButton, QProgressBar, QMessageBox,
+                             QVBoxLayout, QHBoxLayout)
+from PyQt5.QtCore import Qt, QTimer, QThread, QObject, QEvent, pyqtSignal
+from PyQt5.QtGui import QPalette, QColor
+
+import theme
+from countdown import Countdown
+from bank_watcher import watch_bank
+from question_bank import QuestionBankError, get_shared_bank, question_key
+from question_selector import PlayerProfile, QuestionRatings, QuestionSelector, DEFAULT_PLAYER
+from quiz_session import QuizSession, QUESTIONS_PER_GAME, grade_for
+from telemetry import EventLog, DEFAULT_PATH as EVENTS_PATH
+
+IMPORTED = time.perf_counter()
+
+# Оценка из grade_for -> (название, цвет, эмодзи, сообщение)
+GRADE_TEXTS = {
+    "excellent": ("ОТЛИЧНО", "#27ae60", "🏆", "ВЫ ГЕНИЙ! БЛЕСТЯЩИЙ РЕЗУЛЬТАТ!"),
+    "good": ("ХОРОШО", "#f39c12", "👍", "ОТЛИЧНАЯ РАБОТА! ВЫ МОЛОДЕЦ!"),
+    "satisfactory": ("УДОВЛЕТВОРИТЕЛЬНО", "#3498db", "😊", "НЕПЛОХО! ТАК ДЕРЖАТЬ!"),
+    "poor": ("НУЖНО ПОДУЧИТЬ", "#e74c3c", "📚", "ЕСТЬ КУДА СТРЕМИТЬСЯ!"),
+}
+
+
+class BankLoader(QThread):
+    """Загрузка банка вопросов в фоновом потоке"""
+    progress = pyqtSignal(dict)
+    loaded = pyqtSignal(float)
+    failed = pyqtSignal(str)
+
+    def __init__(self, bank, parent=None):
+        super().__init__(parent)
+        self.bank = bank
+
+    def run(self):
+        started = time.perf_counter()
+        try:
+            self.bank.load(progress=self.progress.emit)
+        except QuestionBankError as e:
+            self.failed.emit(str(e))
+            return
+        except Exception as e:
+            self.failed.emit(f"Ошибка загрузки вопросов: {str(e)}")
+            return
+        self.loaded.emit(time.perf_counter() - started)
+
+
+class StartupProfiler(QObject):
+    """Замер времени запуска (--profile-startup)"""
+
+    def __init__(self):
+        super().__init__()
+        self.times = {"import": IMPORTED - STARTED}
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and "first_paint" not in self.times:
+            self.times["first_paint"] = time.perf_counter() - STARTED
+            QTimer.singleShot(0, self.report_if_done)
+        return False
+
+    def bank_loaded(self, elapsed):
+        self.times["bank_load"] = elapsed
+        self.times["bank_ready"] = time.perf_counter() - STARTED
+        self.report_if_done()
+
+    def report_if_done(self):
+        if "first_paint" not in self.times or "bank_load" not in self.times:
+            return
+        print("Профиль запуска:")
+        print(f"  импорт модулей:    {self.times['import'] * 1000:8.1f} мс")
+        print(f"  первая отрисовка:  {self.times['first_paint'] * 1000:8.1f} мс от старта")
+        print(f"  загрузка банка:    {self.times['bank_load'] * 1000:8.1f} мс "
+              f"(готов через {self.times['bank_ready'] * 1000:.1f} мс от старта)")
+        sys.exit(0)
+
+
+class QuizApp(QMainWindow):
+    def __init__(self, profiler=None, events=None, player=None, game_length=QUESTIONS_PER_GAME,
+                 ratings=None):
+        super().__init__()
+        self.bank = None
+        self.bank_ready = False
+        self.loader = None
+        self.session = QuizSession([])
+        self.current_time = None
+        self.countdown = Countdown(parent=self)
+        self.countdown.tick.connect(self.update_timer)
+        self.countdown.expired.connect(self.time_out)
+        self.events = events or EventLog()
+        self.player = player or PlayerProfile(DEFAULT_PLAYER)
+        self.ratings = ratings or QuestionRatings()
+        self.game_length = game_length
+        self.selectors = {}  # уровень -> QuestionSelector
+        self.profiler = profiler
+        self.level_buttons = {}
+        self.difficulty_dialog = None
+
+        theme.apply(QApplication.instance())
+        self.load_questions()
+        self.show_difficulty_selection()
+
+    def load_questions(self):
+        """Общий для процесса банк вопросов: загружается в фоне один раз"""
+        self.bank = get_shared_bank("questions")
+        if self.bank.loaded:
+            self.bank_ready = True
+            self.watch_questions()
+            return
+
+        self.loader = BankLoader(self.bank, self)
+        self.loader.progress.connect(self.update_level_counts)
+        self.loader.loaded.connect(self.bank_loaded)
+        self.loader.failed.connect(self.bank_failed)
+        self.loader.start()
+
+    def bank_loaded(self, elapsed):
+        """Банк загружен: включаем кнопки уровней"""
+        self.loader.wait()  # поток уже завершает run()
+        self.bank_ready = True
+        self.update_level_counts(self.level_counts())
+        self.watch_questions()
+        if self.profiler:
+            self.profiler.bank_loaded(elapsed)
+
+    def watch_questions(self):
+        """Горячая перезагрузка: измененный JSON файл разбирается заново"""
+        watch_bank(self.bank).changed.connect(self.questions_changed)
+
+    def questions_changed(self, json_file):
+        # Текущая игра идет со своим списком вопросов, новые вопросы
+        # попадут в следующую игру
+        self.selectors.clear()
+        self.update_level_counts(self.level_counts())
+
+    def level_counts(self):
+        return {d: self.bank.count(d) for d in self.level_buttons}
+
+    def bank_failed(self, message):
+        QMessageBox.critical(None, "Ошибка", message)
+        sys.exit(1)
+
+    def update_level_counts(self, counts):
+        """Количество вопросов на кнопках уровней во время загрузки"""
+        if "all" not in counts:
+            counts = dict(counts, all=sum(counts.values()))
+        for diff_id, (btn, diff_name) in self.level_buttons.items():
+            count = counts.get(diff_id, 0)
+            btn.setText(f"{diff_name} — вопросов: {count}")
+            btn.setEnabled(self.bank_ready and count > 0)
+
+    def show_difficulty_selection(self):
+        """Показ окна выбора уровня сложности"""
+        if self.difficulty_dialog is None:
+            self.build_difficulty_selection()
+        return self.difficulty_dialog.exec_()
+
+    def build_difficulty_selection(self):
+        """Создание окна выбора уровня (один раз на окно игры)"""
+        self.difficulty_dialog = QDialog(self)
+        self.difficulty_dialog.setWindowTitle("Выбор уровня сложности")
+        self.difficulty_dialog.setObjectName("difficultyDialog")
+        self.difficulty_dialog.setFixedSize(500, 400)
+        if self.profiler:
+            self.difficulty_dialog.installEventFilter(self.profiler)
+        self.level_buttons = {}
+
+        layout = QVBoxLayout()
+        layout.setSpacing(20)
+        layout.setContentsMargins(30, 30, 30, 30)
+
+        # Заголовок
+        title_label = QLabel("🎮 ВИКТОРИНА")
+        title_label.setObjectName("titleLabel")
+        title_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(title_label)
+
+        subtitle_label = QLabel("Выберите уровень сложности:")
+        subtitle_label.setObjectName("subtitleLabel")
+        subtitle_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(subtitle_label)
+
+        layout.addSpacing(20)
+
+        # Кнопки выбора сложности
+        difficulties = [
+            ("easy", "🍰 ПРОСТОЙ",
+             "• 30 секунд на ответ\n• Простые вопросы\n• Подсказки доступны"),
+            ("medium", "⚖️ СРЕДНИЙ",
+             "• 20 секунд на ответ\n• Вопросы средней сложности\n• Без подсказок"),
+            ("hard", "🔥 СЛОЖНЫЙ",
+             "• 10 секунд на ответ\n• Сложные вопросы\n• Штраф за неправильные ответы")
+        ]
+
+        for diff_id, diff_name, description in difficulties:
+            diff_btn = QPushButton(diff_name)
+            diff_btn.setMinimumHeight(70)
+            diff_btn.setProperty("role", "level")
+            diff_btn.setProperty("level", diff_id)
+            # Уровень доступен, когда банк вопросов загрузится
+            diff_btn.setEnabled(False)
+            self.level_buttons[diff_id] = (diff_btn, diff_name)
+
+            # Создаем виджет с описанием
+            desc_widget = QWidget()
+            desc_layout = QVBoxLayout()
+            desc_label = QLabel(description)
+            desc_label.setProperty("role", "description")
+            desc_label.setWordWrap(True)
+            desc_layout.addWidget(desc_label)
+            desc_widget.setLayout(desc_layout)
+
+            # Используем lambda с сохранением значения
+            diff_btn.clicked.connect(lambda checked, d=diff_id: self.set_difficulty_and_start(d))
+
+            layout.addWidget(diff_btn)
+            layout.addWidget(desc_widget)
+
+        # Кнопка "Все уровни"
+        all_btn = QPushButton("🌈 ВСЕ УРОВНИ")
+        all_btn.setObjectName("allLevelsButton")
+        all_btn.setMinimumHeight(60)
+        all_btn.setEnabled(False)
+        self.level_buttons["all"] = (all_btn, "🌈 ВСЕ УРОВНИ")
+        all_btn.clicked.connect(lambda: self.set_difficulty_and_start("all"))
+
+        layout.addSpacing(20)
+        layout.addWidget(all_btn)
+
+        self.difficulty_dialog.setLayout(layout)
+        if self.bank_ready:
+            self.update_level_counts(self.level_counts())
+
+    def set_difficulty_and_start(self, difficulty):
+        """Установка уровня сложности и начало игры"""
+        # Кнопки уровней включаются после загрузки банка, но при вызове
+        # из кода дожидаемся фонового потока
+        if self.loader is not None:
+            self.loader.wait()
+
+        # Проверяем, есть ли вопросы для выбранного уровня
+        if not self.bank.count(difficulty):
+            QMessageBox.warning(self.difficulty_dialog, "Внимание",
+                                f"Для уровня '{self.get_difficulty_name(difficulty)}' нет вопросов!\n"
+                                f"Выберите другой уровень или добавьте вопросы с нужной сложностью.")
+            return
+
+        # Вопросы выбираются по одному с учетом рейтинга игрока и без
+        # повторов уже показанных ему. Пул уровня строится один раз и
+        # перестраивается только после изменения файлов вопросов
+        selector = self.selectors.get(difficulty)
+        if selector is None:
+            self.player.ensure_capacity(len(self.bank))
+            selector = QuestionSelector(self.bank.questions_for(difficulty), self.player,
+                                        ratings=self.ratings)
+            # Пул "все уровни" пересекается с остальными, поэтому храним
+            # только пул текущего уровня: в других отметки могли устареть
+            self.selectors = {difficulty: selector}
+        self.session = QuizSession([], difficulty, selector=selector, length=self.game_length)
+        self.events.new_session()
+
+        print(f"Выбран уровень: {difficulty}, вопросов: {self.session.total}")
+
+        # Закрываем диалог выбора сложности
+        self.difficulty_dialog.accept()
+
+        # Интерфейс создается один раз, при смене уровня только сбрасывается
+        if self.centralWidget() is None:
+            self.init_ui()
+        self.reset_ui()
+        self.show()
+        self.show_question()
+
+    def get_difficulty_name(self, difficulty=None):
+        """Получение названия уровня сложности"""
+        if difficulty is None:
+            difficulty = self.session.difficulty
+
+        names = {
+            "easy": "ПРОСТОЙ",
+            "medium": "СРЕДНИЙ",
+            "hard": "СЛОЖНЫЙ",
+            "all": "ВСЕ УРОВНИ"
+        }
+        return names.get(difficulty, "СРЕДНИЙ")
+
+    def init_ui(self):
+        """Инициализация интерфейса главного окна"""
+        self.setGeometry(300, 100, 850, 700)
+
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+
+        main_layout = QVBoxLayout()
+        main_layout.setSpacing(15)
+
+        # Верхняя панель
+        top_panel = QHBoxLayout()
+
+        # Уровень сложности
+        self.difficulty_label = QLabel()
+        self.difficulty_label.setObjectName("difficultyLabel")
+        top_panel.addWidget(self.difficulty_label)
+
+        top_panel.addStretch()
+
+        # Таймер
+        self.timer_label = QLabel()
+        self.timer_label.setObjectName("timerLabel")
+        self.timer_label.setProperty("level", "normal")
+        top_panel.addWidget(self.timer_label)
+
+        top_panel.addStretch()
+
+        # Счет
+        self.score_label = QLabel()
+        self.score_label.setObjectName("scoreLabel")
+        self.score_label.setProperty("state", "normal")
+        top_panel.addWidget(self.score_label)
+
+        main_layout.addLayout(top_panel)
+
+        # Панель прогресса
+        progress_panel = QHBoxLayout()
+
+        self.progress_label = QLabel()
+        self.progress_label.setObjectName("progressLabel")
+        progress_panel.addWidget(self.progress_label)
+
+        progress_panel.addStretch()
+
+        self.skipped_label = QLabel()
+        self.skipped_label.setObjectName("skippedLabel")
+        progress_panel.addWidget(self.skipped_label)
+
+        main_layout.addLayout(progress_panel)
+
+        # Прогресс-бар
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setObjectName("progressBar")
+        self.progress_bar.setTextVisible(True)
+        main_layout.addWidget(self.progress_bar)
+
+        # Индикатор сложности текущего вопроса
+        self.question_difficulty_label = QLabel()
+        self.question_difficulty_label.setObjectName("questionDifficultyLabel")
+        self.question_difficulty_label.setAlignment(Qt.AlignCenter)
+        self.question_difficulty_label.setMaximumHeight(30)
+        main_layout.addWidget(self.question_difficulty_label)
+
+        # Категория вопроса
+        self.category_label = QLabel()
+        self.category_label.setObjectName("categoryLabel")
+        self.category_label.setAlignment(Qt.AlignCenter)
+        main_layout.addWidget(self.category_label)
+
+        # Вопрос
+        self.question_label = QLabel()
+        self.question_label.setObjectName("questionLabel")
+        self.question_label.setWordWrap(True)
+        self.question_label.setAlignment(Qt.AlignCenter)
+        self.question_label.setMinimumHeight(180)
+        main_layout.addWidget(self.question_label)
+
+        # Кнопки с вариантами ответов
+        self.option_buttons = []
+        for i in range(4):
+            btn = QPushButton()
+            btn.setMinimumHeight(65)
+            # Цвет кнопки (синий, зеленый, красный, фиолетовый) задает тема
+            btn.setProperty("role", "option")
+            btn.setProperty("slot", str(i))
+            btn.setProperty("state", "neutral")
+            btn.clicked.connect(lambda checked, idx=i: self.check_answer(idx))
+            self.option_buttons.append(btn)
+            main_layout.addWidget(btn)
+
+        # Нижняя панель с кнопками
+        bottom_panel = QHBoxLayout()
+
+        # Кнопка "Подсказка" (только для простого уровня)
+        self.hint_btn = QPushButton("💡 Подсказка")
+        self.hint_btn.setObjectName("hintButton")
+        self.hint_btn.setMinimumHeight(45)
+        self.hint_btn.clicked.connect(self.show_hint)
+        bottom_panel.addWidget(self.hint_btn)
+
+        bottom_panel.addStretch()
+
+        # Кнопка "Пропустить вопрос"
+        self.skip_btn = QPushButton("⏭️ Пропустить")
+        self.skip_btn.setObjectName("skipButton")
+        self.skip_btn.setMinimumHeight(45)
+        self.skip_btn.clicked.connect(self.skip_question)
+        bottom_panel.addWidget(self.skip_btn)
+
+        # Кнопка "Следующий вопрос"
+        self.next_btn = QPushButton("Далее →")
+        self.next_btn.setObjectName("nextButton")
+        self.next_btn.setMinimumHeight(45)
+        self.next_btn.clicked.connect(self.next_question)
+        self.next_btn.setEnabled(False)
+        bottom_panel.addWidget(self.next_btn)
+
+        main_layout.addLayout(bottom_panel)
+
+        # Кнопка "Сменить уровень"
+        self.change_difficulty_btn = QPushButton("🔄 Сменить уровень сложности")
+        self.change_difficulty_btn.setObjectName("changeDifficultyButton")
+        self.change_difficulty_btn.setMinimumHeight(40)
+        self.change_difficulty_btn.clicked.connect(self.restart_with_difficulty)
+        main_layout.addWidget(self.change_difficulty_btn)
+
+        central_widget.setLayout(main_layout)
+
+    def reset_ui(self):
+        """Сброс интерфейса под текущую игру (уровень, счет, прогресс)"""
+        self.setWindowTitle(f"Викторина - Уровень: {self.get_difficulty_name()}")
+        self.difficulty_label.setText(f"Уровень: {self.get_difficulty_name()}")
+        theme.set_state(self.difficulty_label, "difficulty", self.session.difficulty)
+        self.timer_label.setText(f"⏱️ {self.session.time_limit} сек")
+
+        self.score_label.setText(f"🏆 Счет: {self.session.score}")
+        theme.set_state(self.score_label, "state", "normal")
+        self.skipped_label.setText(f"⏭️ Пропущено: {self.session.skipped}")
+        self.progress_label.setText(f"Вопрос {self.session.current + 1}/{self.session.total}")
+        self.progress_bar.setMaximum(self.session.total)
+        self.progress_bar.setValue(0)
+
+        # Восстанавливаем видимость элементов после экрана итогов
+        for btn in self.option_buttons:
+            btn.setVisible(True)
+        self.next_btn.setVisible(True)
+        self.skip_btn.setVisible(True)
+        self.hint_btn.setVisible(True)
+        self.hint_btn.setEnabled(self.session.hints_allowed)  # только для простого уровня
+        self.question_difficulty_label.setVisible(True)
+
+    def get_difficulty_color(self):
+        """Получение цвета для уровня сложности"""
+        colors = {
+            "easy": "#27ae60",
+            "medium": "#e67e22",
+            "hard": "#c0392b",
+            "all": "#9b59b6"
+        }
+        return colors.get(self.session.difficulty, "#3498db")
+
+    def start_timer(self):
+        """Запуск таймера для вопроса"""
+        self.current_time = None
+        theme.set_state(self.timer_label, "level", "normal")
+        self.countdown.start(self.session.time_limit)
+
+    def update_timer(self, remaining):
+        """Обновление таймера (remaining - сколько секунд осталось)"""
+        # Меньше секунды показываем с десятыми (для коротких лимитов)
+        shown = math.ceil(remaining) if remaining >= 1 else round(remaining, 1)
+        if shown == self.current_time:
+            return
+        self.current_time = shown
+        self.timer_label.setText(f"⏱️ {shown} сек")
+
+        # Меняем цвет при малом времени
+        if remaining < self.session.time_limit:
+            if shown <= 5:
+                theme.set_state(self.timer_label, "level", "critical")
+            elif shown <= 10:
+                theme.set_state(self.timer_label, "level", "warning")
+
+    def log_event(self, event, **fields):
+        """Событие по текущему вопросу со временем от его показа"""
+        question = self.session.question
+        self.events.record(event, level=self.session.difficulty,
+                           question=question_key(question),
+                           difficulty=question.difficulty,
+                           latency_ms=round(self.countdown.elapsed_ms(), 1),
+                           **fields)
+
+    def time_out(self):
+        """Действия при истечении времени"""
+        self.countdown.stop()
+        self.timer_label.setText("⏱️ ВРЕМЯ!")
+
+        # Автоматически считаем ответ неправильным
+        self.session.time_out()
+        self.log_event("timeout")
+        self.skipped_label.setText(f"⏭️ Пропущено: {self.session.skipped}")
+
+        # Показываем правильный ответ
+        self.highlight_options("correct")
+
+        self.next_btn.setEnabled(True)
+        self.skip_btn.setEnabled(False)
+        self.hint_btn.setEnabled(False)
+
+    def show_question(self):
+        """Отображение текущего вопроса"""
+        if self.session.finished:
+            self.show_results()
+            return
+
+        # Обновляем прогресс-бар
+        self.progress_bar.setValue(self.session.current)
+
+        question_data = self.session.question
+
+        # Обновляем интерфейс
+        self.question_label.setText(question_data.question)
+        self.category_label.setText(f"📁 Категория: {question_data.category or 'Общие знания'}")
+        self.progress_label.setText(f"Вопрос {self.session.current + 1}/{self.session.total}")
+
+        # Отображаем сложность вопроса
+        difficulty = question_data.difficulty
+        diff_text = {
+            'easy': '🍰 Легкий вопрос',
+            'medium': '⚖️ Средний вопрос',
+            'hard': '🔥 Сложный вопрос'
+        }.get(difficulty, '⚖️ Средний вопрос')
+
+        self.question_difficulty_label.setText(diff_text)
+        theme.set_state(self.question_difficulty_label, "difficulty", difficulty)
+
+        # Отображаем варианты ответов
+        options = question_data.options
+        for i in range(4):
+            if i < len(options):
+                self.option_buttons[i].setText(f"{chr(65 + i)}) {options[i]}")
+                self.option_buttons[i].setVisible(True)
+                self.option_buttons[i].setEnabled(True)
+
+                # Восстанавливаем оригинальный цвет кнопки
+                theme.set_state(self.option_buttons[i], "state", "neutral")
+            else:
+                self.option_buttons[i].setVisible(False)
+
+        # Сбрасываем состояние кнопок
+        self.next_btn.setEnabled(False)
+        self.skip_btn.setEnabled(True)
+        self.hint_btn.setEnabled(self.session.hints_allowed)
+
+        # Запускаем таймер
+        if self.session.time_limit > 0:
+            self.start_timer()
+
+    def check_answer(self, option_index):
+        """Проверка выбранного ответа"""
+        if self.session.resolved:
+            return
+
+        # Останавливаем таймер
+        self.countdown.stop()
+
+        # Проверяем ответ и обновляем счет
+        delta = self.session.answer(option_index)
+        self.log_event("answer", option=option_index,
+                       correct=option_index == self.session.question.answer, points=delta)
+
+        # Блокируем все кнопки и подсвечиваем ответы
+        self.highlight_options("correct", option_index)
+
+        if option_index == self.session.question.answer:
+            self.score_label.setText(f"🏆 Счет: {self.session.score} (+{delta}!)")
+            theme.set_state(self.score_label, "state", "gain")
+        else:
+            # Штраф за неправильный ответ на сложном уровне
+            if self.session.difficulty == "hard":
+                self.score_label.setText(f"🏆 Счет: {self.session.score} (-{self.session.penalty}!)")
+
+            theme.set_state(self.score_label, "state", "loss")
+
+        self.next_btn.setEnabled(True)
+        self.skip_btn.setEnabled(False)
+        self.hint_btn.setEnabled(False)
+
+    def highlight_options(self, correct_state, chosen=None):
+        """Блокировка вариантов и подсветка правильного (и выбранного) ответа"""
+        correct_answer = self.session.question.answer
+        for i, btn in enumerate(self.option_buttons):
+            btn.setEnabled(False)
+            if i == correct_answer:
+                theme.set_state(btn, "state", correct_state)
+            elif i == chosen:
+                theme.set_state(btn, "state", "wrong")
+            else:
+                theme.set_state(btn, "state", "dimmed")
+
+    def show_hint(self):
+        """Показать подсказку (только для простого уровня)"""
+        # Убираем два неправильных варианта
+        indices_to_disable = self.session.hint()
+        if not indices_to_disable:
+            return
+        self.log_event("hint", removed=indices_to_disable)
+
+        for i in indices_to_disable:
+            self.option_buttons[i].setEnabled(False)
+            theme.set_state(self.option_buttons[i], "state", "hinted")
+
+        self.hint_btn.setEnabled(False)
+        QMessageBox.information(self, "Подсказка",
+                                "Два неправильных варианта были скрыты!\nУ вас осталось 2 варианта на выбор.")
+
+    def skip_question(self):
+        """Пропуск текущего вопроса"""
+        # Останавливаем таймер
+        self.countdown.stop()
+
+        delta = self.session.skip()
+        self.log_event("skip", points=delta)
+        self.skipped_label.setText(f"⏭️ Пропущено: {self.session.skipped}")
+
+        # Штраф за пропуск на сложном уровне
+        if self.session.difficulty == "hard":
+            self.score_label.setText(f"🏆 Счет: {self.session.score} (-{self.session.penalty} за пропуск!)")
+
+        # Показываем правильный ответ
+        self.highlight_options("revealed")
+
+        self.next_btn.setEnabled(True)
+        self.skip_btn.setEnabled(False)
+        self.hint_btn.setEnabled(False)
+
+    def next_question(self):
+        """Переход к следующему вопросу"""
+        if self.session.advance():
+            self.show_question()
+            # Возвращаем обычный стиль счету
+            theme.set_state(self.score_label, "state", "normal")
+        else:
+            self.show_results()
+
+    def show_results(self):
+        """Показ результатов викторины"""
+        # Останавливаем таймер
+        self.countdown.stop()
+        self.events.flush()
+        self.player.save()
+        self.ratings.save()
+
+        total_answered = self.session.current
+        total_skipped = self.session.skipped
+        total_correct = self.session.correct_answers
+
+        # Расчет процента правильных ответов
+        percentage = self.session.percentage()
+
+        # Обновляем прогресс-бар
+        self.progress_bar.setValue(self.session.total)
+
+        # Скрываем ненужные элементы
+        for btn in self.option_buttons:
+            btn.setVisible(False)
+        self.next_btn.setVisible(False)
+        self.skip_btn.setVisible(False)
+        self.hint_btn.setVisible(False)
+        self.question_difficulty_label.setVisible(False)
+
+        # Определяем результат по тем же правилам, что симуляция и сервер
+        grade = grade_for(self.session)
+        if grade == "game_over":
+            result_text = self.get_game_over_text(total_answered, total_skipped, total_correct, percentage)
+        elif grade == "lost":
+            result_text = self.get_lost_text(total_answered, total_skipped, total_correct, percentage)
+        else:
+            result_text = self.get_regular_results_text(total_answered, total_skipped, total_correct,
+                                                        percentage, grade)
+
+        self.question_label.setText(result_text)
+        self.category_label.setText("🎮 ИТОГИ ВИКТОРИНЫ")
+        self.progress_label.setText("Викторина завершена!")
+
+        # Меняем цвет в зависимости от результата
+        theme.set_state(self.score_label, "state", "loss" if total_correct == 0 else "gain")
+
+    def get_game_over_text(self, answered, skipped, correct, percentage):
+        """Текст для полного проигрыша"""
+        return f"""
+        <div style='text-align: center;'>
+            <h1 style='color: #e74c3c;'>🎮 ВИКТОРИНА ЗАВЕРШЕНА 🎮</h1>
+            <div style='font-size: 80px; margin: 20px; color: #e74c3c;'>💀</div>
+            <h2 style='color: #e74c3c; font-size: 24px;'>ВЫ НЕ ОТВЕТИЛИ НИ НА ОДИН ВОПРОС!</h2>
+
+            <div style='background-color: #ffebee; padding: 20px; border-radius: 10px; margin: 20px; border: 2px solid #ffcdd2;'>
+                <p style='font-size: 20px;'><b>Статистика уровня "{self.get_difficulty_name()}":</b></p>
+                <p style='font-size: 18px;'>Всего вопросов: <b>{self.session.total}</b></p>
+                <p style='font-size: 18px; color: #e74c3c;'>Отвечено: <b>0</b></p>
+                <p style='font-size: 18px; color: #e74c3c;'>Пропущено: <b>{skipped}</b></p>
+                <p style='font-size: 18px; color: #e74c3c;'>Итоговый счет: <b>{self.session.score}</b></p>
+            </div>
+
+            <p style='font-size: 18px; color: #7f8c8d; margin-top: 20px;'>
+                Попробуйте выбрать более простой уровень<br>
+                или отвечать на вопросы, а не пропускать их!
+            </p>
+        </div>
+        """
+
+    def get_lost_text(self, answered, skipped, correct, percentage):
+        """Текст для проигрыша (есть ответы, но все неправильные)"""
+        return f"""
+        <div style='text-align: center;'>
+            <h1 style='color: #e74c3c;'>😔 ВЫ ПРОИГРАЛИ НА УРОВНЕ "{self.get_difficulty_name()}"</h1>
+            <div style='font-size: 80px; margin: 20px;'>😟</div>
+
+            <div style='background-color: #fff3e0; padding: 20px; border-radius: 10px; margin: 20px; border: 2px solid #ffe0b2;'>
+                <p style='font-size: 20px;'><b>Результаты уровня "{self.get_difficulty_name()}":</b></p>
+                <p style='font-size: 18px;'>Всего вопросов: <b>{self.session.total}</b></p>
+                <p style='font-size: 18px;'>Отвечено: <b>{answered}</b></p>
+                <p style='font-size: 18px; color: #e74c3c;'>Правильных ответов: <b>0/{answered}</b></p>
+                <p style='font-size: 18px;'>Пропущено: <b>{skipped}</b></p>
+                <p style='font-size: 18px;'>Итоговый счет: <b>{self.session.score}</b></p>
+                <p style='font-size: 18px;'>Процент правильных: <b>{percentage:.1f}%</b></p>
+            </div>
+
+            <p style='font-size: 18px; color: #7f8c8d; margin-top: 20px;'>
+                Уровень <span style='color: {self.get_difficulty_color()}; font-weight: bold;'>{self.get_difficulty_name()}</span> оказался слишком сложным.<br>
+                Попробуйте уровень <span style='color: #27ae60; font-weight: bold;'>ПРОСТОЙ</span> для начала!
+            </p>
+        </div>
+        """
+
+    def get_regular_results_text(self, answered, skipped, correct, percentage, grade):
+        """Текст для обычных результатов"""
+        grade, grade_color, emoji, message = GRADE_TEXTS[grade]
+
+        return f"""
+        <div style='text-align: center;'>
+            <h1 style='color: {grade_color};'>{emoji} {message} {emoji}</h1>
+            <div style='font-size: 60px; margin: 20px;'>{emoji}</div>
+
+            <div style='background-color: #f8f9fa; padding: 20px; border-radius: 10px; margin: 20px; border: 2px solid {grade_color};'>
+                <p style='font-size: 22px; color: {grade_color};'><b>ОЦЕНКА: {grade}</b></p>
+                <p style='font-size: 20px;'>Уровень сложности: <b style='color: {self.get_difficulty_color()};'>{self.get_difficulty_name()}</b></p>
+
+                <div style='display: flex; justify-content: center; gap: 30px; margin: 20px 0; flex-wrap: wrap;'>
+                    <div style='text-align: center; min-width: 120px;'>
+                        <div style='font-size: 32px; font-weight: bold; color: {grade_color};'>{self.session.score}</div>
+                        <div style='font-size: 14px; color: #7f8c8d;'>Итоговый счет</div>
+                    </div>
+
+                    <div style='text-align: center; min-width: 120px;'>
+                        <div style='font-size: 32px; font-weight: bold; color: #3498db;'>{correct}/{answered}</div>
+                        <div style='font-size: 14px; color: #7f8c8d;'>Правильные ответы</div>
+                    </div>
+
+                    <div style='text-align: center; min-width: 120px;'>
+                        <div style='font-size: 32px; font-weight: bold; color: #9b59b6;'>{percentage:.1f}%</div>
+                        <div style='font-size: 14px; color: #7f8c8d;'>Эффективность</div>
+                    </div>
+
+                    <div style='text-align: center; min-width: 120px;'>
+                        <div style='font-size: 32px; font-weight: bold; color: #{'2ecc71' if skipped == 0 else 'f39c12' if skipped < 3 else 'e74c3c'};'>{skipped}</div>
+                        <div style='font-size: 14px; color: #7f8c8d;'>Пропущено</div>
+                    </div>
+                </div>
+
+                <p style='font-size: 16px; color: #7f8c8d; margin-top: 10px;'>
+                    Всего вопросов: <b>{self.session.total}</b> | 
+                    Отвечено: <b>{answered}</b> | 
+                    Уровень: <b style='color: {self.get_difficulty_color()};'>{self.get_difficulty_name()}</b>
+                </p>
+            </div>
+
+            <div style='font-size: 18px; color: #7f8c8d; margin-top: 20px; padding: 15px; background-color: #f0f8ff; border-radius: 8px;'>
+                {'🎯 Вы мастер этой викторины! Можете попробовать уровень СЛОЖНЫЙ!' if percentage >= 90 else
+        '👍 Отличный результат! Можете попробовать уровень СРЕДНИЙ!' if percentage >= 70 else
+        '💪 Хорошая попытка! Продолжайте тренироваться!' if percentage >= 50 else
+        '📚 Рекомендуем начать с уровня ПРОСТОЙ для лучшего результата!'}
+            </div>
+        </div>
+        """
+
+    def restart_with_difficulty(self):
+        """Перезапуск с выбором уровня сложности в том же окне"""
+        # Пока открыт выбор уровня, время на ответ не идет
+        self.countdown.pause()
+
+        if self.show_difficulty_selection() != QDialog.Accepted:
+            # Выбор отменен - продолжаем текущую игру
+            self.countdown.resume()
+
+    def restart_quiz(self):
+        """Перезапуск викторины с тем же уровнем сложности"""
+        self.session.reset()
+        self.events.new_session()
+
+        self.reset_ui()
+        self.show_question()
+
+
+def non_negative_int(value):
+    if not value.strip().isdigit():
+        raise argparse.ArgumentTypeError(f"нужно целое число >= 0, а не '{value}'")
+    return int(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Викторина")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="вывести время импорта, загрузки банка и первой отрисовки")
+    parser.add_argument("--events", default=EVENTS_PATH,
+                        help="журнал событий с временем ответов (JSON Lines)")
+    parser.add_argument("--player", default=DEFAULT_PLAYER,
+                        help="имя игрока: рейтинг и показанные вопросы хранятся в players/")
+    parser.add_argument("--questions", type=non_negative_int, default=QUESTIONS_PER_GAME,
+                        help="вопросов в одной игре (0 - все вопросы уровня)")
+    parser.add_argument("--server", action="store_true",
+                        help="запустить сервер для многих игроков вместо окна игры")
+    parser.add_argument("--host", default=None, help="адрес сервера (по умолчанию 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=None, help="порт сервера (по умолчанию 8765)")
+    args, qt_args = parser.parse_known_args()
+
+    if args.server:
+        # asyncio и сервер нужны только здесь: окну игры они замедляли бы запуск
+        from quiz_server import run_server, DEFAULT_HOST, DEFAULT_PORT
+        host = DEFAULT_HOST if args.host is None else args.host
+        port = DEFAULT_PORT if args.port is None else args.port
+        sys.exit(run_server(host, port, game_length=args.questions))
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    app.setStyle('Fusion')
+
+    palette = QPalette()
+    palette.setColor(QPalette.Window, QColor(255, 255, 255))
+    palette.setColor(QPalette.WindowText, QColor(44, 62, 80))
+    app.setPalette(palette)
+
+    player = PlayerProfile.load(args.player)
+    ratings = QuestionRatings.load()
+    atexit.register(player.save)
+    atexit.register(ratings.save)
+
+    window = QuizApp(profiler=StartupProfiler() if args.profile_startup else None,
+                     events=EventLog(args.events), player=player, game_length=args.questions,
+                     ratings=ratings)
+
+    sys.exit(app.exec_())
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
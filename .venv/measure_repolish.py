@@ -0,0 +1,85 @@
+"""Подсчет перерисовок стилей (repolish) на один вопрос.
+
+Запуск: python measure_repolish.py [уровень] [количество вопросов]
+
+Игра проходится без окна (QT_QPA_PLATFORM=offscreen): на каждом вопросе
+таймер отсчитывает все секунды, затем по очереди используются правильный
+ответ, неправильный ответ, пропуск, подсказка и истечение времени.
+Считаются вызовы setStyleSheet, переключения состояний темы и время.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QDialog, QWidget, QMessageBox
+
+import main
+import theme
+from telemetry import EventLog
+
+
+def count_stylesheet_calls():
+    """Подмена QWidget.setStyleSheet счетчиком вызовов"""
+    counter = {"calls": 0}
+    original = QWidget.setStyleSheet
+
+    def counting_set_style_sheet(widget, style):
+        counter["calls"] += 1
+        original(widget, style)
+
+    QWidget.setStyleSheet = counting_set_style_sheet
+    return counter
+
+
+def play(window, level, limit):
+    window.set_difficulty_and_start(level)
+    questions = min(limit, window.session.total)
+    for n in range(questions):
+        # Таймер отсчитывает секунды почти до нуля
+        for remaining in range(window.session.time_limit - 1, 0, -1):
+            window.update_timer(remaining - 0.5)
+
+        question = window.session.question
+        action = n % 5
+        if action == 0:
+            window.check_answer(question.answer)
+        elif action == 1:
+            window.check_answer((question.answer + 1) % len(question.options))
+        elif action == 2:
+            window.skip_question()
+        elif action == 3 and window.hint_btn.isEnabled():
+            window.show_hint()
+            window.check_answer(question.answer)
+        else:
+            window.time_out()
+        window.next_question()
+    return questions
+
+
+def main_measure():
+    level = sys.argv[1] if len(sys.argv) > 1 else "easy"
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    app = QApplication(sys.argv)
+    # Модальные окна не показываем: игра проходится без участия игрока
+    QMessageBox.information = lambda *args, **kwargs: QMessageBox.Ok
+    QDialog.exec_ = lambda dialog: QDialog.Accepted
+    window = main.QuizApp(events=EventLog(os.devnull))
+
+    counter = count_stylesheet_calls()
+    theme.repolish_count = 0
+    started = time.perf_counter()
+    questions = play(window, level, limit)
+    elapsed = time.perf_counter() - started
+
+    print(f"Уровень: {level}, вопросов: {questions}")
+    print(f"setStyleSheet на вопрос: {counter['calls'] / questions:.1f}")
+    print(f"Переключений состояния темы на вопрос: {theme.repolish_count / questions:.1f}")
+    print(f"Время на вопрос: {elapsed / questions * 1000:.2f} мс")
+    app.quit()
+
+
+if __name__ == '__main__':
+    main_measure()
@@ -0,0 +1,539 @@
+import gc
+import os
+import sys
+import json
+import struct
+import hashlib
+import operator
+from array import array
+from itertools import islice
+from contextlib import contextmanager
+
+DIFFICULTIES = ("easy", "medium", "hard")
+DEFAULT_DIFFICULTY = "medium"
+CACHE_FILE = ".bank_cache.bin"
+CACHE_VERSION = 3
+CACHE_MAGIC = b"QBANK\x00\x00\x00"
+
+# Колонки одного уровня в кэше: тексты в UTF-8 через \0, концы строк,
+# номер первой строки каждого вопроса, ответы, номера категорий и индекс
+# категорий - позиции вопросов, сгруппированные по категории
+COLUMNS = (("text", "B"), ("ends", "I"), ("first", "I"), ("answers", "i"), ("cats", "H"),
+           ("order", "I"))
+
+# Банки, общие для всего процесса (папка -> QuestionBank)
+_shared_banks = {}
+
+
+@contextmanager
+def gc_paused():
+    """Сборщик мусора выключен, пока создается много объектов"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class QuestionBankError(Exception):
+    """Ошибка загрузки банка вопросов"""
+
+
+class Question:
+    """Компактная запись вопроса"""
+    __slots__ = ("question", "options", "answer", "category", "difficulty")
+
+    def __init__(self, question, options, answer, category, difficulty):
+        self.question = question
+        self.options = options
+        self.answer = answer
+        self.category = category
+        self.difficulty = difficulty
+
+    def __repr__(self):
+        return f"Question({self.question!r}, difficulty={self.difficulty!r})"
+
+
+class QuestionColumns:
+    """Вопросы одного уровня файла, хранящиеся колонками.
+
+    Так вопросы лежат в кэше: загрузка не создает ни одного объекта на
+    вопрос, Question собирается при первом обращении к нему и дальше
+    возвращается тот же самый.
+    """
+    __slots__ = ("difficulty", "names", "category_ends", "columns", "_items")
+
+    def __init__(self, difficulty, names, category_ends, columns, items=None):
+        self.difficulty = difficulty
+        self.names = names                  # номер категории -> название
+        self.category_ends = category_ends  # номер категории -> конец ее позиций в order
+        self.columns = columns              # имя колонки -> memoryview
+        self._items = items
+
+    @classmethod
+    def from_questions(cls, difficulty, questions):
+        chunks = []
+        ends = array("I")
+        first = array("I", [0])
+        answers = array("i")
+        cats = array("H")
+        names = {}
+        positions = []
+        end = -1
+        for index, question in enumerate(questions):
+            for text in (question.question, *question.options):
+                chunk = text.encode('utf-8')
+                if b"\0" in chunk:
+                    raise ValueError("\\0 в тексте вопроса")
+                chunks.append(chunk)
+                end += len(chunk) + 1
+                ends.append(end)
+            first.append(len(ends))
+            answers.append(question.answer)
+            number = names.setdefault(question.category, len(names))
+            cats.append(number)
+            if number == len(positions):
+                positions.append([])
+            positions[number].append(index)
+        order = array("I")
+        category_ends = []
+        for category_positions in positions:
+            order.extend(category_positions)
+            category_ends.append(len(order))
+        columns = {"text": memoryview(b"\0".join(chunks)), "ends": memoryview(ends),
+                   "first": memoryview(first), "answers": memoryview(answers),
+                   "cats": memoryview(cats), "order": memoryview(order)}
+        # Уже созданные вопросы остаются теми же объектами
+        items = questions if isinstance(questions, list) else None
+        return cls(difficulty, list(names), category_ends, columns, items)
+
+    def __len__(self):
+        return len(self.columns["answers"])
+
+    def __getitem__(self, index):
+        if self._items is None:
+            self._items = [None] * len(self)
+        question = self._items[index]
+        if question is None:
+            if index < 0:
+                index += len(self)
+            question = self._items[index] = self._build(index)
+        return question
+
+    def __iter__(self):
+        return iter(self.materialize())
+
+    def materialize(self):
+        """Все вопросы уровня: недостающие собираются разом из колонок"""
+        items = self._items
+        if items is None:
+            items = self._items = [None] * len(self)
+        elif None not in items:
+            return items
+        texts = str(self.columns["text"], 'utf-8', 'replace').split("\0")
+        if len(texts) != len(self.columns["ends"]):
+            texts = None
+        first = self.columns["first"].tolist()
+        answers = self.columns["answers"].tolist()
+        cats = self.columns["cats"].tolist()
+        with gc_paused():
+            self._fill(items, texts, first, answers, cats)
+        return items
+
+    def _fill(self, items, texts, first, answers, cats):
+        names = self.names
+        difficulty = self.difficulty
+        for index, question in enumerate(items):
+            if question is not None:
+                continue
+            if texts is None:
+                items[index] = self._build(index)
+                continue
+            start, stop = first[index], first[index + 1]
+            items[index] = Question(texts[start], texts[start + 1:stop], answers[index],
+                                    names[cats[index]], difficulty)
+
+    def _text(self, number):
+        ends = self.columns["ends"]
+        start = ends[number - 1] + 1 if number else 0
+        return str(self.columns["text"][start:ends[number]], 'utf-8', 'replace')
+
+    def _build(self, index):
+        first = self.columns["first"]
+        start, stop = first[index], first[index + 1]
+        return Question(self._text(start), [self._text(n) for n in range(start + 1, stop)],
+                        self.columns["answers"][index], self.names[self.columns["cats"][index]],
+                        self.difficulty)
+
+    def category_positions(self, category):
+        """Позиции вопросов категории по индексу, без перебора уровня"""
+        if category not in self.names:
+            return []
+        number = self.names.index(category)
+        start = self.category_ends[number - 1] if number else 0
+        return self.columns["order"][start:self.category_ends[number]].tolist()
+
+
+class BankFile:
+    """Вопросы одного JSON файла, уже разложенные по уровням сложности"""
+    __slots__ = ("mtime_ns", "size", "digest", "levels", "_columns")
+
+    def __init__(self, mtime_ns, size, digest, levels):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+        self.levels = levels  # сложность -> [Question] или QuestionColumns
+        self._columns = None
+
+    def __len__(self):
+        return sum(len(items) for items in self.levels.values())
+
+    @classmethod
+    def from_questions(cls, mtime_ns, size, digest, questions):
+        levels = {}
+        for question in questions:
+            levels.setdefault(question.difficulty, []).append(question)
+        return cls(mtime_ns, size, digest, levels)
+
+    def columns(self):
+        """Уровни файла колонками с индексом категорий (строятся один раз).
+
+        Из кэша уровни уже колонки; файл, разобранный заново, раскладывается
+        при записи кэша или при первом запросе категории.
+        """
+        if self._columns is None:
+            self._columns = {difficulty: items if isinstance(items, QuestionColumns)
+                             else QuestionColumns.from_questions(difficulty, items)
+                             for difficulty, items in self.levels.items()}
+        return self._columns
+
+    def category_names(self):
+        return {name for items in self.columns().values() for name in items.names}
+
+    def in_category(self, category):
+        result = []
+        for items in self.columns().values():
+            result.extend(items[i] for i in items.category_positions(category))
+        return result
+
+
+class QuestionBank:
+    """Банк вопросов с индексами по сложности и категории.
+
+    Разобранные JSON файлы хранятся в двоичном кэше рядом с вопросами:
+    заголовок JSON и колонки array, без pickle, поэтому подложенный кэш
+    не может выполнить код. Колонки читаются одним блоком и вопросы из них
+    создаются только при обращении. При следующей загрузке заново читаются
+    только те файлы, у которых изменились mtime/размер и содержимое.
+    """
+
+    def __init__(self, questions_dir="questions"):
+        self.questions_dir = questions_dir
+        self.files = {}  # имя файла -> BankFile
+        self.by_difficulty = {d: {} for d in DIFFICULTIES}
+        self.loaded = False
+
+    @property
+    def cache_path(self):
+        return os.path.join(self.questions_dir, CACHE_FILE)
+
+    def __len__(self):
+        return sum(len(entry) for entry in self.files.values())
+
+    def load(self, progress=None):
+        """Загрузка банка: кэш + повторный разбор только изменившихся файлов.
+
+        progress(counts) вызывается после каждого файла с количеством
+        уже загруженных вопросов по уровням сложности.
+        """
+        if not os.path.exists(self.questions_dir):
+            raise QuestionBankError(f"Директория '{self.questions_dir}' не найдена!")
+
+        json_files = sorted(f for f in os.listdir(self.questions_dir) if f.endswith('.json'))
+        if not json_files:
+            raise QuestionBankError(f"В директории '{self.questions_dir}' нет JSON файлов!")
+
+        # Сборщик мусора на время загрузки отключаем: сотни тысяч новых
+        # объектов иначе запускают его постоянно
+        with gc_paused():
+            self._load_files(json_files, progress)
+
+        if not len(self):
+            raise QuestionBankError("Не удалось загрузить ни одного вопроса!")
+        self.loaded = True
+        print(f"Загружено {len(self)} вопросов")
+
+    def _load_files(self, json_files, progress):
+        cached = self._read_cache()
+        changed = len(cached) != len(json_files)
+        self.files = {}
+        counts = dict.fromkeys(DIFFICULTIES, 0)
+
+        for json_file in json_files:
+            try:
+                entry = self._load_file(json_file, cached.get(json_file))
+                if entry is not cached.get(json_file):
+                    changed = True
+                self.files[json_file] = entry
+                if progress is not None:
+                    for difficulty, items in entry.levels.items():
+                        counts[difficulty] = counts.get(difficulty, 0) + len(items)
+                    progress(dict(counts))
+
+            except json.JSONDecodeError as e:
+                print(f"Ошибка JSON в файле {json_file}: {e}")
+                continue
+            except Exception as e:
+                print(f"Ошибка загрузки {json_file}: {e}")
+                continue
+
+        self._build_indexes()
+        if changed and self.files:
+            self._write_cache()
+
+    def _load_file(self, json_file, entry):
+        """Файл из кэша, если он не менялся, иначе повторный разбор"""
+        file_path = os.path.join(self.questions_dir, json_file)
+        stat = os.stat(file_path)
+        if entry is not None and (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+            return entry
+
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha1(raw).hexdigest()
+        if entry is not None and entry.digest == digest:
+            return BankFile(stat.st_mtime_ns, stat.st_size, digest, entry.levels)
+        return BankFile.from_questions(stat.st_mtime_ns, stat.st_size, digest,
+                                       parse_questions(raw, json_file))
+
+    def reload_file(self, json_file):
+        """Повторный разбор одного файла с заменой его вопросов в индексах.
+
+        Возвращает True, если вопросы файла изменились. При ошибке в JSON
+        остаются прежние вопросы файла. Кэш на диске не переписывается:
+        при следующем запуске этот файл будет разобран заново.
+        """
+        if not os.path.exists(os.path.join(self.questions_dir, json_file)):
+            return self.remove_file(json_file)
+
+        old_entry = self.files.get(json_file)
+        try:
+            entry = self._load_file(json_file, old_entry)
+        except json.JSONDecodeError as e:
+            print(f"Ошибка JSON в файле {json_file}: {e}")
+            return False
+        except Exception as e:
+            print(f"Ошибка загрузки {json_file}: {e}")
+            return False
+
+        self.files[json_file] = entry
+        if old_entry is not None and entry.levels is old_entry.levels:
+            return False
+        self._unindex_file(json_file)
+        for difficulty, items in entry.levels.items():
+            self.by_difficulty.setdefault(difficulty, {})[json_file] = items
+        print(f"Обновлен файл {json_file}: {len(entry)} вопросов")
+        return True
+
+    def remove_file(self, json_file):
+        """Удаление вопросов файла из банка"""
+        if self.files.pop(json_file, None) is None:
+            return False
+        self._unindex_file(json_file)
+        print(f"Удален файл {json_file}")
+        return True
+
+    def _unindex_file(self, json_file):
+        for level in self.by_difficulty.values():
+            level.pop(json_file, None)
+
+    def _build_indexes(self):
+        self.by_difficulty = {d: {} for d in DIFFICULTIES}
+        for json_file, entry in self.files.items():
+            for difficulty, items in entry.levels.items():
+                self.by_difficulty.setdefault(difficulty, {})[json_file] = items
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = f.read()
+            return read_cache(data)
+        except Exception:
+            return {}
+
+    def _write_cache(self):
+        tmp_path = self.cache_path + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                write_cache(f, self.files)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Не удалось сохранить кэш вопросов: {e}")
+
+    def count(self, difficulty="all"):
+        """Количество вопросов уровня без перебора всего банка"""
+        if difficulty == "all":
+            return len(self)
+        return sum(len(items) for items in self.by_difficulty.get(difficulty, {}).values())
+
+    def questions_for(self, difficulty="all"):
+        """Новый список вопросов уровня ("all" - все вопросы)"""
+        if difficulty == "all":
+            groups = [items for entry in self.files.values() for items in entry.levels.values()]
+        else:
+            groups = self.by_difficulty.get(difficulty, {}).values()
+        result = []
+        for items in groups:
+            result.extend(items)
+        return result
+
+    def categories(self):
+        """Список всех категорий банка"""
+        return sorted({category for entry in self.files.values()
+                       for category in entry.category_names()})
+
+    def questions_in_category(self, category):
+        """Новый список вопросов категории"""
+        result = []
+        for entry in self.files.values():
+            result.extend(entry.in_category(category))
+        return result
+
+
+def parse_questions(raw, json_file):
+    """Разбор содержимого JSON файла в список Question"""
+    category_name = json_file.replace('.json', '').capitalize()
+    return [
+        Question(item['question'], item['options'], item['answer'],
+                 item.get('category', category_name),
+                 item.get('difficulty', DEFAULT_DIFFICULTY))
+        for item in json.loads(raw)
+    ]
+
+
+def write_cache(f, files):
+    """Запись кэша: MAGIC, длина заголовка, заголовок JSON, колонки.
+
+    Файл, который не удалось разложить по колонкам (например, ответ не
+    число), в кэш не попадает и при следующей загрузке разбирается заново.
+    """
+    header = {"version": CACHE_VERSION, "byteorder": sys.byteorder, "files": {}}
+    sections = []
+    offset = 0
+    for json_file, entry in files.items():
+        try:
+            levels = entry.columns()
+        except (TypeError, ValueError, OverflowError, AttributeError):
+            continue
+        file_header = {"mtime_ns": entry.mtime_ns, "size": entry.size,
+                       "digest": entry.digest, "levels": {}}
+        for difficulty, items in levels.items():
+            spans = {}
+            for name, _ in COLUMNS:
+                column = items.columns[name]
+                spans[name] = [offset, column.nbytes]
+                sections.append(column)
+                # Колонки выровнены по 8 байт
+                padding = -column.nbytes % 8
+                if padding:
+                    sections.append(bytes(padding))
+                offset += column.nbytes + padding
+            file_header["levels"][difficulty] = {"categories": items.names,
+                                                 "category_ends": items.category_ends,
+                                                 "columns": spans}
+        header["files"][json_file] = file_header
+
+    raw_header = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    raw_header += b" " * (-(len(CACHE_MAGIC) + 4 + len(raw_header)) % 8)
+    f.write(CACHE_MAGIC)
+    f.write(struct.pack("<I", len(raw_header)))
+    f.write(raw_header)
+    for section in sections:
+        f.write(section)
+
+
+def read_cache(data):
+    """Разбор кэша из write_cache: имя файла -> BankFile с QuestionColumns.
+
+    Колонки - срезы memoryview над data, без копирования. Кэш не той
+    версии или с другим порядком байт считается пустым.
+    """
+    start = len(CACHE_MAGIC) + 4
+    if data[:len(CACHE_MAGIC)] != CACHE_MAGIC:
+        return {}
+    header_size, = struct.unpack("<I", data[len(CACHE_MAGIC):start])
+    header = json.loads(bytes(data[start:start + header_size]))
+    if header.get("version") != CACHE_VERSION or header.get("byteorder") != sys.byteorder:
+        return {}
+
+    body_start = start + header_size
+    body = memoryview(data)[body_start:]
+    files = {}
+    for json_file, file_header in header["files"].items():
+        levels = {}
+        for difficulty, level in file_header["levels"].items():
+            columns = {}
+            for name, typecode in COLUMNS:
+                offset, size = level["columns"][name]
+                if offset < 0 or offset + size > len(body):
+                    raise ValueError(f"колонка {name} за пределами кэша")
+                columns[name] = body[offset:offset + size].cast(typecode)
+            offset, size = level["columns"]["text"]
+            separators = data.count(b"\0", body_start + offset, body_start + offset + size)
+            check_columns(columns, level["categories"], level["category_ends"],
+                          separators, json_file)
+            levels[difficulty] = QuestionColumns(difficulty, level["categories"],
+                                                 level["category_ends"], columns)
+        files[json_file] = BankFile(file_header["mtime_ns"], file_header["size"],
+                                    file_header["digest"], levels)
+    return files
+
+
+def _increasing(values):
+    return all(map(operator.lt, values, islice(values, 1, None)))
+
+
+def check_columns(columns, names, category_ends, separators, json_file):
+    """Колонки уровня из кэша, по которым вопрос не соберется, - ValueError.
+
+    Проверяются все индексы, которые используют QuestionColumns: номера
+    категорий, номера строк вопросов, концы строк (separators - число \0
+    в тексте) и индекс категорий. Иначе испорченный кэш падал бы уже в игре и оставался на
+    диске, пока не изменится файл вопросов.
+    """
+    count = len(columns["answers"])
+    first, ends, cats = columns["first"], columns["ends"], columns["cats"]
+    if len(cats) != count or len(first) != count + 1:
+        raise ValueError(f"{json_file}: разная длина колонок")
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        raise ValueError(f"{json_file}: некорректный список категорий")
+    if count and max(cats) >= len(names):
+        raise ValueError(f"{json_file}: номер категории вне списка")
+    if first[0] != 0 or first[-1] != len(ends) or not _increasing(first):
+        raise ValueError(f"{json_file}: некорректные номера строк вопросов")
+    if ends and (ends[-1] != len(columns["text"]) or not _increasing(ends)):
+        raise ValueError(f"{json_file}: некорректные концы строк")
+    if separators != max(len(ends) - 1, 0) or (not ends and len(columns["text"])):
+        raise ValueError(f"{json_file}: строки не совпадают с текстом")
+    order = columns["order"]
+    if (not isinstance(category_ends, list) or len(category_ends) != len(names)
+            or not all(isinstance(end, int) for end in category_ends)
+            or category_ends != sorted(category_ends)
+            or (category_ends and (category_ends[0] < 0 or category_ends[-1] != len(order)))
+            or len(order) != count or (count and max(order) >= count)):
+        raise ValueError(f"{json_file}: некорректный индекс категорий")
+
+
+def question_key(question):
+    """Короткий стабильный идентификатор вопроса по его тексту"""
+    return hashlib.sha1(question.question.encode('utf-8')).hexdigest()[:12]
+
+
+def get_shared_bank(questions_dir="questions"):
+    """Один банк на процесс для всех окон игры"""
+    bank = _shared_banks.get(questions_dir)
+    if bank is None:
+        bank = _shared_banks[questions_dir] = QuestionBank(questions_dir)
+    return bank
@@ -0,0 +1,373 @@
+"""Адаптивный выбор следующего вопроса.
+
+Рейтинг Эло есть и у игрока, и у вопроса: вопрос начинает с рейтинга
+своего уровня сложности, а каждый ответ сдвигает оба рейтинга навстречу
+друг другу. Вопрос выбирается с вероятностью тем выше, чем ближе
+ожидаемая вероятность правильного ответа к TARGET_SUCCESS. Вопросы пула
+разложены по полосам рейтинга шириной BAND_WIDTH, непоказанные отмечены
+в дереве Фенвика: полоса выбирается по весу, вопрос внутри нее - за
+O(log n) даже на миллионах вопросов, а после ответа веса пересчитывать
+не нужно. Полосы перестраиваются вместе с пулом: вопрос, чей рейтинг
+изменился, до этого все равно уже показан.
+
+Показанные вопросы запоминаются в профиле игрока (players/<имя>.json)
+компактной битовой картой по crc32 текста вопроса и не повторяются между
+играми, пока в пуле не кончатся новые. Рейтинги вопросов хранятся по тому
+же crc32 в players/.question_ratings.json, только для вопросов с ответами.
+"""
+import os
+import re
+import json
+import math
+import zlib
+import base64
+import random
+from array import array
+
+PLAYERS_DIR = "players"
+DEFAULT_PLAYER = "player"
+
+# Рейтинг нового игрока и скорость его изменения (Эло)
+START_RATING = 1500.0
+K_FACTOR = 32
+
+# Начальный рейтинг вопроса по уровню сложности
+QUESTION_RATINGS = {
+    "easy": 1300,
+    "medium": 1500,
+    "hard": 1700
+}
+
+# Скорость изменения рейтинга вопроса (на вопрос отвечают многие игроки)
+K_QUESTION = 16
+MIN_QUESTION_RATING = 100
+MAX_QUESTION_RATING = 3000
+RATINGS_FILE = ".question_ratings.json"
+
+# Ширина полосы рейтинга вопросов в пуле
+BAND_WIDTH = 50
+
+# Желаемая вероятность правильного ответа и ширина окна вокруг нее
+TARGET_SUCCESS = 0.7
+SUCCESS_WIDTH = 0.15
+
+# Минимальный вес: далекие по сложности вопросы тоже иногда выпадают
+MIN_WEIGHT = 0.05
+
+# Бит карты показанных вопросов на вопрос банка (меньше совпадений хэшей)
+SEEN_BITS_PER_QUESTION = 16
+MIN_SEEN_BITS = 1024
+
+
+def question_rating(question):
+    """Начальный рейтинг вопроса"""
+    return QUESTION_RATINGS.get(question.difficulty, QUESTION_RATINGS["medium"])
+
+
+def text_crc(question):
+    # crc32 втрое быстрее sha1 из question_key, а пул строится на каждую игру
+    return zlib.crc32(question.question.encode('utf-8'))
+
+
+class FenwickTree:
+    """Дерево Фенвика: сумма на префиксе, изменение и поиск по сумме за O(log n)"""
+
+    def __init__(self, values):
+        self.size = len(values)
+        tree = [0]
+        tree.extend(values)
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self._top = 1 << (self.size.bit_length() - 1) if self.size else 0
+
+    def add(self, index, delta):
+        i = index + 1
+        while i <= self.size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix(self, end):
+        """Сумма элементов [0, end)"""
+        total = 0
+        while end > 0:
+            total += self._tree[end]
+            end -= end & -end
+        return total
+
+    def find(self, value):
+        """Наименьший индекс, для которого prefix(index + 1) > value"""
+        pos = 0
+        step = self._top
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and self._tree[nxt] <= value:
+                pos = nxt
+                value -= self._tree[nxt]
+            step >>= 1
+        return pos
+
+
+class PlayerProfile:
+    """Рейтинг игрока и карта показанных ему вопросов.
+
+    Бит вопроса - младшие биты его хэша. Размер карты - степень двойки,
+    поэтому при росте банка карта удваивается копированием: каждый старый
+    бит переходит в оба своих новых места и отметки не теряются.
+    """
+
+    def __init__(self, name=DEFAULT_PLAYER, players_dir=None):
+        self.name = name
+        self.players_dir = players_dir  # None - профиль только в памяти
+        self.rating = START_RATING
+        self.answered = 0
+        self.seen = bytearray(MIN_SEEN_BITS // 8)
+
+    @property
+    def path(self):
+        if self.players_dir is None:
+            return None
+        return os.path.join(self.players_dir, re.sub(r"[^\w-]", "_", self.name) + ".json")
+
+    @classmethod
+    def load(cls, name=DEFAULT_PLAYER, players_dir=PLAYERS_DIR):
+        profile = cls(name, players_dir)
+        if not os.path.exists(profile.path):
+            return profile
+        try:
+            with open(profile.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            profile.rating = float(data["rating"])
+            profile.answered = int(data["answered"])
+            seen = bytearray(zlib.decompress(base64.b64decode(data["seen"])))
+            if len(seen) >= MIN_SEEN_BITS // 8 and len(seen) & (len(seen) - 1) == 0:
+                profile.seen = seen
+        except Exception as e:
+            print(f"Не удалось прочитать профиль {profile.path}: {e}")
+        return profile
+
+    def save(self):
+        if self.path is None:
+            return
+        data = {
+            "name": self.name,
+            "rating": round(self.rating, 2),
+            "answered": self.answered,
+            "seen": base64.b64encode(zlib.compress(bytes(self.seen))).decode('ascii'),
+        }
+        tmp_path = self.path + ".tmp"
+        try:
+            os.makedirs(self.players_dir, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Не удалось сохранить профиль игрока: {e}")
+
+    def ensure_capacity(self, questions):
+        """Размер карты под банк из questions вопросов"""
+        while len(self.seen) * 8 < questions * SEEN_BITS_PER_QUESTION:
+            self.seen = self.seen + self.seen
+
+    def _bit(self, question):
+        return text_crc(question) & (len(self.seen) * 8 - 1)
+
+    def is_seen(self, question):
+        bit = self._bit(question)
+        return bool(self.seen[bit >> 3] & (1 << (bit & 7)))
+
+    def mark_seen(self, question):
+        bit = self._bit(question)
+        self.seen[bit >> 3] |= 1 << (bit & 7)
+
+    def unseen_flags(self, keys):
+        """1 для еще не показанных вопросов, 0 для показанных (keys - text_crc)"""
+        seen = self.seen
+        mask = len(seen) * 8 - 1
+        flags = []
+        for key in keys:
+            bit = key & mask
+            flags.append(0 if seen[bit >> 3] & (1 << (bit & 7)) else 1)
+        return flags
+
+    def forget(self, questions):
+        for question in questions:
+            bit = self._bit(question)
+            self.seen[bit >> 3] &= ~(1 << (bit & 7))
+
+    def expected(self, rating):
+        """Вероятность правильного ответа на вопрос с рейтингом rating"""
+        return 1 / (1 + 10 ** ((rating - self.rating) / 400))
+
+    def record(self, rating, correct):
+        self.rating += K_FACTOR * ((1 if correct else 0) - self.expected(rating))
+        self.answered += 1
+
+
+class QuestionRatings:
+    """Рейтинги вопросов, уточненные ответами игроков.
+
+    Ключ - text_crc вопроса, как у карты показанных вопросов. Хранятся
+    только вопросы, на которые уже отвечали, остальные - с рейтингом уровня.
+    """
+
+    def __init__(self, players_dir=None):
+        self.players_dir = players_dir  # None - рейтинги только в памяти
+        self.ratings = {}  # text_crc -> рейтинг
+
+    @property
+    def path(self):
+        if self.players_dir is None:
+            return None
+        return os.path.join(self.players_dir, RATINGS_FILE)
+
+    @classmethod
+    def load(cls, players_dir=PLAYERS_DIR):
+        ratings = cls(players_dir)
+        if not os.path.exists(ratings.path):
+            return ratings
+        try:
+            with open(ratings.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            keys = array("I", zlib.decompress(base64.b64decode(data["keys"])))
+            values = array("h", zlib.decompress(base64.b64decode(data["ratings"])))
+            if len(keys) == len(values):
+                ratings.ratings = dict(zip(keys, values))
+        except Exception as e:
+            print(f"Не удалось прочитать рейтинги вопросов {ratings.path}: {e}")
+        return ratings
+
+    def save(self):
+        if self.path is None:
+            return
+        keys = array("I", self.ratings)
+        values = array("h", self.ratings.values())
+        data = {
+            "keys": base64.b64encode(zlib.compress(keys.tobytes())).decode('ascii'),
+            "ratings": base64.b64encode(zlib.compress(values.tobytes())).decode('ascii'),
+        }
+        tmp_path = self.path + ".tmp"
+        try:
+            os.makedirs(self.players_dir, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Не удалось сохранить рейтинги вопросов: {e}")
+
+    def rating(self, question, key=None):
+        if key is None:
+            key = text_crc(question)
+        rating = self.ratings.get(key)
+        return question_rating(question) if rating is None else rating
+
+    def record(self, question, expected, correct):
+        """Правильный ответ снижает рейтинг вопроса, ошибка - повышает"""
+        key = text_crc(question)
+        rating = self.rating(question, key) - K_QUESTION * ((1 if correct else 0) - expected)
+        self.ratings[key] = round(min(MAX_QUESTION_RATING, max(MIN_QUESTION_RATING, rating)))
+
+
+class QuestionSelector:
+    """Выбор вопросов из пула уровня с учетом рейтинга и истории игрока"""
+
+    def __init__(self, questions, player, rng=None, target=TARGET_SUCCESS, ratings=None):
+        self.player = player
+        self.rng = rng or random
+        self.target = target
+        self.ratings = ratings if ratings is not None else QuestionRatings()
+        self.drawn = []  # вопросы текущей игры
+
+        # Вопросы с одинаковым текстом делят бит карты показанных и
+        # рейтинг, поэтому в пуле остается только первый из них
+        texts = set()
+        self.pool = []
+        for question in questions:
+            if question.question not in texts:
+                texts.add(question.question)
+                self.pool.append(question)
+        self._build_tree()
+
+    @property
+    def size(self):
+        return len(self.pool)
+
+    def _build_tree(self):
+        """Раскладка пула по полосам текущих рейтингов и дерево непоказанных"""
+        ratings = self.ratings.ratings
+        by_band = {}
+        band_keys = {}
+        for question in self.pool:
+            key = text_crc(question)
+            rating = ratings.get(key)
+            if rating is None:
+                rating = question_rating(question)
+            band = round(rating / BAND_WIDTH)
+            by_band.setdefault(band, []).append(question)
+            band_keys.setdefault(band, []).append(key)
+
+        # Полосы: (рейтинг, начало, конец) в пуле
+        self.pool = []
+        self.bands = []
+        keys = []
+        for band in sorted(by_band):
+            start = len(self.pool)
+            self.pool.extend(by_band[band])
+            keys.extend(band_keys[band])
+            self.bands.append((band * BAND_WIDTH, start, len(self.pool)))
+        self.tree = FenwickTree(self.player.unseen_flags(keys))
+
+    def start_game(self):
+        self.drawn = []
+
+    def weight(self, rating):
+        """Вес полосы: гауссиана вокруг желаемой вероятности ответа"""
+        distance = (self.player.expected(rating) - self.target) / SUCCESS_WIDTH
+        return MIN_WEIGHT + math.exp(-distance * distance / 2)
+
+    def _reset_pool(self):
+        """Новые вопросы кончились: пул показывается заново (кроме текущей игры)"""
+        self.player.forget(self.pool)
+        for question in self.drawn:
+            self.player.mark_seen(question)
+        self._build_tree()
+
+    def next_question(self):
+        """Следующий вопрос (None, если пул пуст)"""
+        if not self.pool:
+            return None
+        if self.tree.prefix(self.size) == 0:
+            self._reset_pool()
+            if self.tree.prefix(self.size) == 0:
+                # Совпадения хэшей с вопросами этой игры: пул целиком заново
+                self.player.forget(self.pool)
+                self._build_tree()
+
+        bands = []
+        for rating, start, end in self.bands:
+            unseen = self.tree.prefix(end) - self.tree.prefix(start)
+            if unseen:
+                bands.append((self.weight(rating) * unseen, start, unseen))
+        roll = self.rng.random() * sum(weight for weight, _, _ in bands)
+        weight, start, unseen = bands[-1]
+        for band in bands:
+            if roll < band[0]:
+                weight, start, unseen = band
+                break
+            roll -= band[0]
+
+        index = self.tree.find(self.tree.prefix(start) + self.rng.randrange(unseen))
+        self.tree.add(index, -1)
+        question = self.pool[index]
+        self.player.mark_seen(question)
+        self.drawn.append(question)
+        return question
+
+    def record(self, question, correct):
+        """Результат ответа меняет рейтинги игрока и вопроса"""
+        rating = self.ratings.rating(question)
+        expected = self.player.expected(rating)
+        self.player.record(rating, correct)
+        self.ratings.record(question, expected, correct)
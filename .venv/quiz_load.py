@@ -0,0 +1,163 @@
+"""Нагрузочный клиент для сервера викторины.
+
+Запуск (сервер уже работает: python main.py --server):
+    python quiz_load.py --clients 1000 --sessions 20000 --level easy
+
+Каждый клиент держит свое подключение и играет партии подряд: отвечает
+на вопросы, иногда берет подсказку или пропускает вопрос. В конце
+печатается число партий в секунду и задержка ответа сервера на ответ
+игрока (p50/p90/p99).
+"""
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+
+from quiz_server import DEFAULT_HOST, DEFAULT_PORT, LEVELS, MAX_LINE
+from telemetry_summary import percentile
+
+
+class LoadStats:
+    def __init__(self, sessions):
+        self.sessions = sessions
+        self.started = 0
+        self.finished = 0
+        self.answers = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.latencies = []  # мс от отправки ответа до результата
+
+
+async def request(reader, writer, message, stats):
+    """Ответ сервера на message.
+
+    Событие timeout сервер шлет само и может прислать его раньше ответа
+    на любой запрос: такие события считаются и пропускаются.
+    """
+    writer.write(json.dumps(message, ensure_ascii=False).encode('utf-8') + b"\n")
+    await writer.drain()
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("сервер закрыл соединение")
+        reply = json.loads(line)
+        if reply["event"] != "timeout":
+            return reply
+        stats.timeouts += 1
+
+
+async def play(args, stats, rng):
+    """Партии одного клиента, пока не сыграно нужное число"""
+    reader, writer = await asyncio.open_connection(args.host, args.port, limit=MAX_LINE)
+    try:
+        while stats.started < stats.sessions:
+            stats.started += 1
+            message = await request(reader, writer, {"cmd": "start", "level": args.level,
+                                                     "questions": args.questions}, stats)
+            while message["event"] == "question":
+                timeouts = stats.timeouts
+                if args.think:
+                    await asyncio.sleep(rng.uniform(0, 2 * args.think))
+                options = list(range(len(message["options"])))
+                if message["hints"] and rng.random() < args.hint_rate:
+                    hint = await request(reader, writer, {"cmd": "hint"}, stats)
+                    options = [i for i in options if i not in hint.get("removed", ())]
+
+                if rng.random() < args.skip_rate:
+                    command = {"cmd": "skip"}
+                else:
+                    command = {"cmd": "answer", "option": rng.choice(options)}
+                sent = time.perf_counter()
+                result = await request(reader, writer, command, stats)
+                # Если время вышло раньше ответа, ошибка на ответ ожидаема
+                if stats.timeouts == timeouts:
+                    if result["event"] == "error":
+                        stats.errors += 1
+                    else:
+                        stats.latencies.append((time.perf_counter() - sent) * 1000)
+                        stats.answers += 1
+                message = await request(reader, writer, {"cmd": "next"}, stats)
+
+            if message["event"] == "finished":
+                stats.finished += 1
+            else:
+                stats.errors += 1
+                print(f"Ошибка сервера: {message.get('error')}")
+                break
+    finally:
+        writer.close()
+
+
+async def run(args):
+    stats = LoadStats(args.sessions)
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(play(args, stats, random.Random(rng.random()))
+                                     for _ in range(args.clients)), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    failures = [r for r in results if isinstance(r, Exception)]
+    return stats, elapsed, failures
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Нагрузочный тест сервера викторины")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--clients", type=int, default=200, help="одновременных подключений")
+    parser.add_argument("--sessions", type=int, default=2000, help="всего партий")
+    parser.add_argument("--level", default="easy", choices=LEVELS)
+    parser.add_argument("--questions", type=int, default=10, help="вопросов в партии")
+    parser.add_argument("--hint-rate", type=float, default=0.2)
+    parser.add_argument("--skip-rate", type=float, default=0.1)
+    parser.add_argument("--think", type=float, default=0.0,
+                        help="среднее время на раздумье в секундах")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=None, help="записать результат в JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        stats, elapsed, failures = asyncio.run(run(args))
+    except KeyboardInterrupt:
+        return
+    if failures and not stats.finished:
+        print(f"Не удалось подключиться к {args.host}:{args.port}: {failures[0]}")
+        sys.exit(1)
+
+    latencies = sorted(stats.latencies)
+    result = {
+        "clients": args.clients,
+        "sessions": stats.finished,
+        "elapsed_sec": round(elapsed, 3),
+        "sessions_per_sec": round(stats.finished / elapsed, 1),
+        "answers_per_sec": round(stats.answers / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p90": round(percentile(latencies, 0.90), 2),
+            "p99": round(percentile(latencies, 0.99), 2),
+            "max": round(latencies[-1], 2) if latencies else 0,
+        },
+        "timeouts": stats.timeouts,
+        "errors": stats.errors,
+        "client_failures": len(failures),
+    }
+
+    print(f"Партий: {stats.finished} за {elapsed:.1f} с - {result['sessions_per_sec']} партий/с, "
+          f"{result['answers_per_sec']} ответов/с ({args.clients} подключений)")
+    latency = result["latency_ms"]
+    print(f"Задержка ответа: p50 {latency['p50']} мс, p90 {latency['p90']} мс, "
+          f"p99 {latency['p99']} мс, максимум {latency['max']} мс")
+    if stats.timeouts or stats.errors or failures:
+        print(f"Время вышло: {stats.timeouts}, ошибок: {stats.errors}, "
+              f"оборванных клиентов: {len(failures)}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
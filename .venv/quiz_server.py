@@ -0,0 +1,265 @@
+"""Сервер викторины для многих игроков одновременно (asyncio).
+
+Запуск: python main.py --server [--host 0.0.0.0] [--port 8765]
+
+Все подключения играют по правилам QuizSession на одном общем банке
+вопросов в памяти. Время на ответ отсчитывается через loop.call_later,
+отдельные потоки на клиентов не нужны.
+
+Протокол - по одному JSON объекту в строке (UTF-8). Запросы клиента:
+    {"cmd": "levels"}                          уровни и число вопросов
+    {"cmd": "start", "level": "hard"}          новая игра ("questions": N)
+    {"cmd": "answer", "option": 2}             ответ на текущий вопрос
+    {"cmd": "hint"}                            подсказка (простой уровень)
+    {"cmd": "skip"}                            пропуск вопроса
+    {"cmd": "next"}                            следующий вопрос
+Ответы сервера содержат поле "event": levels, question, result, hint,
+timeout (приходит сам по истечении времени), finished или error.
+Нагрузочный клиент: python quiz_load.py
+"""
+import json
+import random
+import asyncio
+
+from question_bank import DIFFICULTIES, QuestionBankError, get_shared_bank
+from quiz_session import QuizSession, QUESTIONS_PER_GAME, grade_for
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Максимальная длина строки запроса
+MAX_LINE = 64 * 1024
+
+LEVELS = DIFFICULTIES + ("all",)
+
+
+class ProtocolError(Exception):
+    """Некорректный запрос клиента"""
+
+
+class QuizServer:
+    """Общий банк вопросов и счетчики для всех подключений"""
+
+    def __init__(self, bank, game_length=QUESTIONS_PER_GAME, rng=None):
+        self.bank = bank
+        self.game_length = game_length
+        self.rng = rng or random.Random()
+        self.pools = {}  # уровень -> общий список вопросов уровня
+        self.connections = 0
+        self.sessions_started = 0
+        self.sessions_finished = 0
+
+    def pool(self, level):
+        pool = self.pools.get(level)
+        if pool is None:
+            pool = self.pools[level] = self.bank.questions_for(level)
+        return pool
+
+    def new_session(self, level, length):
+        """Игра из случайной выборки общего пула (без копии всего уровня)"""
+        pool = self.pool(level)
+        length = min(length or len(pool), len(pool))
+        self.sessions_started += 1
+        return QuizSession(self.rng.sample(pool, length), level, rng=self.rng)
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        client = Client(self, writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    client.send({"event": "error", "error": "слишком длинная строка"})
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    client.send({"event": "error", "error": f"некорректный JSON: {e}"})
+                    continue
+                try:
+                    if not isinstance(request, dict):
+                        raise ProtocolError("запрос должен быть объектом JSON")
+                    client.handle(request)
+                except ProtocolError as e:
+                    client.send({"event": "error", "error": str(e)})
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            client.close()
+            self.connections -= 1
+            writer.close()
+
+
+class Client:
+    """Игра одного подключения"""
+
+    def __init__(self, server, writer):
+        self.server = server
+        self.writer = writer
+        self.loop = asyncio.get_running_loop()
+        self.session = None
+        self.timer = None
+
+    def send(self, message):
+        if not self.writer.is_closing():
+            self.writer.write(json.dumps(message, ensure_ascii=False).encode('utf-8') + b"\n")
+
+    def handle(self, request):
+        command = request.get("cmd")
+        if command == "levels":
+            self.send({"event": "levels",
+                       "levels": {level: self.server.bank.count(level) for level in LEVELS}})
+        elif command == "start":
+            self.start(request.get("level", "all"), request.get("questions", self.server.game_length))
+        elif command in ("answer", "hint", "skip", "next"):
+            if self.session is None:
+                raise ProtocolError("игра не начата (нужен cmd: start)")
+            if command == "answer":
+                self.answer(request.get("option"))
+            elif command == "hint":
+                self.hint()
+            elif command == "skip":
+                self.skip()
+            else:
+                self.next()
+        else:
+            raise ProtocolError(f"неизвестная команда '{command}'")
+
+    def start(self, level, length):
+        if level not in LEVELS:
+            raise ProtocolError(f"неизвестный уровень '{level}'")
+        if not isinstance(length, int) or isinstance(length, bool) or length < 0:
+            raise ProtocolError("questions должно быть целым числом >= 0")
+        if not self.server.bank.count(level):
+            raise ProtocolError(f"для уровня '{level}' нет вопросов")
+        self.cancel_timer()
+        self.session = self.server.new_session(level, length)
+        self.send_question()
+
+    def send_question(self):
+        session = self.session
+        question = session.question
+        self.send({
+            "event": "question",
+            "index": session.current,
+            "total": session.total,
+            "question": question.question,
+            "options": question.options,
+            "category": question.category,
+            "difficulty": question.difficulty,
+            "time_limit": session.time_limit,
+            "hints": session.hints_allowed,
+            "score": session.score,
+        })
+        if session.time_limit > 0:
+            self.timer = self.loop.call_later(session.time_limit, self.time_out)
+
+    def cancel_timer(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def require_open_question(self):
+        if self.session.finished:
+            raise ProtocolError("игра завершена")
+        if self.session.resolved:
+            raise ProtocolError("на вопрос уже ответили (нужен cmd: next)")
+
+    def result(self, points, **fields):
+        self.send({"event": "result", "answer": self.session.question.answer,
+                   "points": points, "score": self.session.score, **fields})
+
+    def answer(self, option):
+        self.require_open_question()
+        options = self.session.question.options
+        if not isinstance(option, int) or isinstance(option, bool) or not 0 <= option < len(options):
+            raise ProtocolError(f"option должен быть номером варианта 0-{len(options) - 1}")
+        self.cancel_timer()
+        points = self.session.answer(option)
+        self.result(points, correct=option == self.session.question.answer)
+
+    def skip(self):
+        self.require_open_question()
+        self.cancel_timer()
+        self.result(self.session.skip(), skipped=True)
+
+    def hint(self):
+        self.require_open_question()
+        if not self.session.hints_allowed:
+            raise ProtocolError("подсказки доступны только на простом уровне")
+        removed = self.session.hint()
+        if not removed:
+            raise ProtocolError("подсказка уже использована")
+        self.send({"event": "hint", "removed": removed})
+
+    def time_out(self):
+        """Время вышло (вызывается циклом событий)"""
+        self.timer = None
+        if self.session is None or self.session.resolved:
+            return
+        self.session.time_out()
+        self.send({"event": "timeout", "answer": self.session.question.answer,
+                   "score": self.session.score})
+
+    def next(self):
+        if self.session.finished:
+            raise ProtocolError("игра завершена")
+        if not self.session.resolved:
+            raise ProtocolError("сначала ответьте или пропустите вопрос")
+        if self.session.advance():
+            self.send_question()
+            return
+        session = self.session
+        self.server.sessions_finished += 1
+        self.send({
+            "event": "finished",
+            "score": session.score,
+            "correct": session.correct_answers,
+            "skipped": session.skipped,
+            "total": session.total,
+            "percentage": round(session.percentage(), 1),
+            "grade": grade_for(session),
+        })
+
+    def close(self):
+        self.cancel_timer()
+        self.session = None
+
+
+async def serve(bank, host=DEFAULT_HOST, port=DEFAULT_PORT, game_length=QUESTIONS_PER_GAME):
+    server = QuizServer(bank, game_length)
+    listener = await asyncio.start_server(server.handle, host, port, limit=MAX_LINE,
+                                          backlog=4096)
+    print(f"Сервер викторины: {host}:{port}, вопросов в банке: {len(bank)}")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        print(f"Игр начато: {server.sessions_started}, завершено: {server.sessions_finished}")
+
+
+def run_server(host=DEFAULT_HOST, port=DEFAULT_PORT, questions_dir="questions",
+               game_length=QUESTIONS_PER_GAME):
+    """Загрузка общего банка и запуск сервера до Ctrl+C"""
+    bank = get_shared_bank(questions_dir)
+    try:
+        bank.load()
+    except QuestionBankError as e:
+        print(f"Ошибка: {e}")
+        return 1
+    try:
+        asyncio.run(serve(bank, host, port, game_length))
+    except KeyboardInterrupt:
+        print("Сервер остановлен")
+    except OSError as e:
+        print(f"Ошибка запуска сервера: {e}")
+        return 1
+    return 0
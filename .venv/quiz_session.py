@@ -0,0 +1,192 @@
+"""Правила викторины без графического интерфейса.
+
+QuizSession хранит состояние одной игры (текущий вопрос, счет, пропуски)
+и применяет правила: очки за сложность вопроса, штраф на сложном уровне,
+подсказки на простом уровне, пропуски и истечение времени. QuizApp только
+отображает результат, а simulate.py гоняет те же правила без Qt.
+
+С QuestionSelector вопросы не перемешиваются заранее, а выбираются по
+одному с учетом рейтинга игрока (question_selector.py).
+"""
+import random
+
+# Очки за правильный ответ в зависимости от сложности вопроса
+POINTS = {
+    "easy": 1,
+    "medium": 2,
+    "hard": 3
+}
+
+# Время на ответ (в секундах) для уровня
+TIME_LIMITS = {
+    "easy": 30,
+    "medium": 20,
+    "hard": 10,
+    "all": 25
+}
+
+# Штраф за неправильный ответ или пропуск на сложном уровне
+HARD_PENALTY = 1
+
+# Уровни, на которых доступна подсказка
+HINT_LEVELS = ("easy",)
+
+# Сколько неправильных вариантов убирает подсказка
+HINT_REMOVES = 2
+
+# Вопросов в одной игре с адаптивным выбором (0 - весь пул уровня)
+QUESTIONS_PER_GAME = 10
+
+# Пороги оценок из итогов игры (процент -> оценка)
+GRADES = ((90, "excellent"), (70, "good"), (50, "satisfactory"), (0, "poor"))
+
+
+class QuizSession:
+    """Состояние и правила одной игры"""
+
+    def __init__(self, questions, difficulty="all", points=None, time_limits=None,
+                 penalty=HARD_PENALTY, rng=None, selector=None, length=QUESTIONS_PER_GAME):
+        self.questions = questions
+        self.difficulty = difficulty
+        self.points = POINTS if points is None else points
+        self.time_limits = TIME_LIMITS if time_limits is None else time_limits
+        self.penalty = penalty
+        self.rng = rng or random
+        self.selector = selector
+        self.length = length
+        self.reset(shuffle=False)
+
+    def reset(self, shuffle=True, questions=None):
+        """Начало игры заново с тем же набором вопросов или с новым questions"""
+        if self.selector is not None:
+            # Новая игра - новые вопросы от селектора
+            self.questions = []
+            self.selector.start_game()
+        elif questions is not None:
+            self.questions = questions
+        elif shuffle:
+            self.rng.shuffle(self.questions)
+        self.current = 0
+        self.score = 0
+        self.correct_answers = 0
+        self.skipped = 0
+        self.user_answer = None
+        self.resolved = False
+        self.hint_used = False
+        self._draw()
+
+    def _draw(self):
+        """Выбор следующего вопроса, когда до него дошла игра"""
+        if self.selector is not None and len(self.questions) == self.current < self.total:
+            self.questions.append(self.selector.next_question())
+
+    @property
+    def time_limit(self):
+        return self.time_limits.get(self.difficulty, self.time_limits["all"])
+
+    @property
+    def total(self):
+        if self.selector is None:
+            return len(self.questions)
+        if self.length:
+            return min(self.length, self.selector.size)
+        return self.selector.size
+
+    @property
+    def finished(self):
+        return self.current >= self.total
+
+    @property
+    def question(self):
+        return self.questions[self.current]
+
+    @property
+    def hints_allowed(self):
+        return self.difficulty in HINT_LEVELS
+
+    def points_for(self, question):
+        return self.points.get(question.difficulty, 1)
+
+    def _apply_penalty(self):
+        """Штраф на сложном уровне (счет не уходит в минус)"""
+        if self.difficulty != "hard":
+            return 0
+        before = self.score
+        self.score = max(0, self.score - self.penalty)
+        return self.score - before
+
+    def answer(self, option_index):
+        """Ответ на текущий вопрос. Возвращает изменение счета или None,
+        если на вопрос уже ответили"""
+        if self.resolved:
+            return None
+        self.resolved = True
+        self.user_answer = option_index
+        self._record(option_index == self.question.answer)
+
+        if option_index == self.question.answer:
+            points = self.points_for(self.question)
+            self.score += points
+            self.correct_answers += 1
+            return points
+        return self._apply_penalty()
+
+    def skip(self):
+        """Пропуск вопроса. Возвращает изменение счета"""
+        self.resolved = True
+        self.user_answer = None
+        self.skipped += 1
+        self._record(False)
+        return self._apply_penalty()
+
+    def time_out(self):
+        """Время вышло: вопрос считается пропущенным без штрафа"""
+        self.resolved = True
+        self.skipped += 1
+        self._record(False)
+
+    def _record(self, correct):
+        if self.selector is not None:
+            self.selector.record(self.question, correct)
+
+    def hint(self):
+        """Подсказка: индексы неправильных вариантов, которые нужно убрать"""
+        if not self.hints_allowed or self.hint_used or self.resolved:
+            return []
+        self.hint_used = True
+        question = self.question
+        wrong_indices = [i for i in range(len(question.options)) if i != question.answer]
+        self.rng.shuffle(wrong_indices)
+        return wrong_indices[:HINT_REMOVES]
+
+    def advance(self):
+        """Переход к следующему вопросу. False, если вопросы закончились"""
+        self.current += 1
+        self.user_answer = None
+        self.resolved = False
+        self.hint_used = False
+        self._draw()
+        return not self.finished
+
+    def max_possible_score(self):
+        """Максимум очков за уже пройденные вопросы"""
+        return sum(self.points_for(q) for q in self.questions[:self.current])
+
+    def percentage(self):
+        """Процент набранных очков от максимально возможных"""
+        max_possible_score = self.max_possible_score()
+        if max_possible_score <= 0:
+            return 0
+        return self.score / max_possible_score * 100
+
+
+def grade_for(session):
+    """Итог игры: по нему показывает результаты окно, считает симуляция и сервер"""
+    if session.current == 0:
+        return "game_over"
+    if session.correct_answers == 0:
+        return "lost"
+    percentage = session.percentage()
+    for threshold, grade in GRADES:
+        if percentage >= threshold:
+            return grade
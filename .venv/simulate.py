@@ -0,0 +1,233 @@
+"""Пакетная симуляция игроков для подбора очков и времени на ответ.
+
+Синтетические игроки проходят уровень по тем же правилам QuizSession,
+что и в игре. Симуляция распределяется по пулу процессов, а итоговые
+распределения счета и процентов записываются в JSON.
+
+Пример:
+    python simulate.py --level hard --players 1000000 --accuracy 0.6 \\
+        --timeout-rate 0.1 --points 1,2,4 --output hard.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from collections import Counter
+from multiprocessing import Pool
+
+from question_bank import QuestionBank, QuestionBankError, DIFFICULTIES
+from quiz_session import QuizSession, POINTS, TIME_LIMITS, HARD_PENALTY, grade_for
+
+# Игроков в одной задаче для процесса
+CHUNK_SIZE = 10000
+
+_worker = {}
+
+
+def _init_worker(questions, config):
+    _worker["questions"] = questions
+    _worker["config"] = config
+
+
+def play_player(session, questions, rng, config):
+    """Одна игра синтетического игрока.
+
+    Вопросы игры выбираются rng.sample: перемешивать весь уровень ради
+    max_questions вопросов слишком дорого на больших банках.
+    """
+    accuracy = config["accuracy"]
+    spread = config["accuracy_spread"]
+    if spread:
+        accuracy = min(1.0, max(0.0, rng.uniform(accuracy - spread, accuracy + spread)))
+    mean_response = config["response_time"]
+    time_limit = session.time_limit
+
+    count = config["max_questions"]
+    session.reset(questions=rng.sample(questions, count) if count < len(questions) else questions)
+    while not session.finished:
+        roll = rng.random()
+        timed_out = roll < config["timeout_rate"]
+        if not timed_out and mean_response:
+            timed_out = rng.expovariate(1 / mean_response) > time_limit
+
+        if timed_out:
+            session.time_out()
+        elif roll < config["timeout_rate"] + config["skip_rate"]:
+            session.skip()
+        else:
+            question = session.question
+            choices = range(len(question.options))
+            if session.hints_allowed and rng.random() < config["hint_rate"]:
+                removed = session.hint()
+                choices = [i for i in choices if i not in removed]
+            if rng.random() < accuracy:
+                session.answer(question.answer)
+            else:
+                session.answer(rng.choice(choices))
+        session.advance()
+
+
+def simulate_chunk(task):
+    """Симуляция части игроков в процессе пула"""
+    players, seed = task
+    config = _worker["config"]
+    rng = random.Random(seed)
+    questions = _worker["questions"]
+    session = QuizSession(questions, config["level"], points=config["points"],
+                          time_limits=config["time_limits"], penalty=config["penalty"], rng=rng)
+
+    scores = Counter()
+    percentages = Counter()
+    grades = Counter()
+    correct = skipped = answered = 0
+    for _ in range(players):
+        play_player(session, questions, rng, config)
+        scores[session.score] += 1
+        percentages[int(session.percentage())] += 1
+        grades[grade_for(session)] += 1
+        correct += session.correct_answers
+        skipped += session.skipped
+        answered += session.current
+    return scores, percentages, grades, correct, skipped, answered
+
+
+def percentile(histogram, total, fraction):
+    """Процентиль по гистограмме {значение: количество}"""
+    target = fraction * total
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen >= target:
+            return value
+    return 0
+
+
+def summarize(config, scores, percentages, grades, correct, skipped, answered, elapsed):
+    players = sum(scores.values())
+    mean_score = sum(score * count for score, count in scores.items()) / players
+    variance = sum(count * (score - mean_score) ** 2 for score, count in scores.items()) / players
+    return {
+        "config": config,
+        "players": players,
+        "elapsed_sec": round(elapsed, 3),
+        "score": {
+            "mean": round(mean_score, 4),
+            "stdev": round(variance ** 0.5, 4),
+            "p10": percentile(scores, players, 0.10),
+            "p50": percentile(scores, players, 0.50),
+            "p90": percentile(scores, players, 0.90),
+            "max": max(scores),
+        },
+        "correct_rate": round(correct / answered, 4) if answered else 0,
+        "skip_rate": round(skipped / answered, 4) if answered else 0,
+        "grades": {grade: grades[grade] / players for grade in sorted(grades)},
+        "score_distribution": {str(score): scores[score] for score in sorted(scores)},
+        "percentage_distribution": {str(p): percentages[p] for p in sorted(percentages)},
+    }
+
+
+def parse_points(value):
+    values = [int(v) for v in value.split(",")]
+    if len(values) != len(DIFFICULTIES):
+        raise argparse.ArgumentTypeError("нужно три значения: easy,medium,hard")
+    return dict(zip(DIFFICULTIES, values))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Симуляция игроков викторины")
+    parser.add_argument("--level", default="all", choices=DIFFICULTIES + ("all",))
+    parser.add_argument("--players", type=int, default=100000)
+    parser.add_argument("--accuracy", type=float, default=0.7,
+                        help="вероятность знать правильный ответ")
+    parser.add_argument("--accuracy-spread", type=float, default=0.0,
+                        help="разброс точности между игроками (±)")
+    parser.add_argument("--hint-rate", type=float, default=0.0,
+                        help="вероятность взять подсказку (только простой уровень)")
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--skip-rate", type=float, default=0.0)
+    parser.add_argument("--response-time", type=float, default=0.0,
+                        help="среднее время ответа в секундах; дольше лимита - время вышло")
+    parser.add_argument("--time-limit", type=float, default=None,
+                        help="время на ответ для уровня вместо стандартного")
+    parser.add_argument("--points", type=parse_points, default=dict(POINTS),
+                        help="очки за easy,medium,hard (например 1,2,3)")
+    parser.add_argument("--penalty", type=int, default=HARD_PENALTY)
+    parser.add_argument("--max-questions", type=int, default=0,
+                        help="вопросов в одной игре (0 - все вопросы уровня)")
+    parser.add_argument("--questions-dir", default="questions")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default="simulation.json")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    bank = QuestionBank(args.questions_dir)
+    try:
+        bank.load()
+    except QuestionBankError as e:
+        print(f"Ошибка: {e}")
+        sys.exit(1)
+    questions = bank.questions_for(args.level)
+    if not questions:
+        print(f"Для уровня '{args.level}' нет вопросов!")
+        sys.exit(1)
+
+    time_limits = dict(TIME_LIMITS)
+    if args.time_limit is not None:
+        time_limits[args.level] = args.time_limit
+    max_questions = args.max_questions or len(questions)
+    config = {
+        "level": args.level,
+        "accuracy": args.accuracy,
+        "accuracy_spread": args.accuracy_spread,
+        "hint_rate": args.hint_rate,
+        "timeout_rate": args.timeout_rate,
+        "skip_rate": args.skip_rate,
+        "response_time": args.response_time,
+        "time_limits": time_limits,
+        "points": args.points,
+        "penalty": args.penalty,
+        "max_questions": max_questions,
+        "questions": len(questions),
+    }
+
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    tasks = []
+    remaining = args.players
+    while remaining > 0:
+        players = min(CHUNK_SIZE, remaining)
+        tasks.append((players, seed + len(tasks)))
+        remaining -= players
+
+    scores, percentages, grades = Counter(), Counter(), Counter()
+    correct = skipped = answered = 0
+    started = time.perf_counter()
+    with Pool(args.processes, initializer=_init_worker, initargs=(questions, config)) as pool:
+        for chunk in pool.imap_unordered(simulate_chunk, tasks):
+            scores.update(chunk[0])
+            percentages.update(chunk[1])
+            grades.update(chunk[2])
+            correct += chunk[3]
+            skipped += chunk[4]
+            answered += chunk[5]
+    elapsed = time.perf_counter() - started
+
+    config["seed"] = seed
+    result = summarize(config, scores, percentages, grades, correct, skipped, answered, elapsed)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    score = result["score"]
+    print(f"Уровень: {args.level}, игроков: {result['players']}, время: {elapsed:.1f} с")
+    print(f"Счет: среднее {score['mean']:.2f}, медиана {score['p50']}, "
+          f"p10 {score['p10']}, p90 {score['p90']}, максимум {score['max']}")
+    print(f"Результаты записаны в {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Журнал игровых событий с временем ответа.
+
+Каждый ответ, пропуск, подсказка и истечение времени записываются как
+одна строка JSON. События копятся в памяти и дописываются в файл пачкой,
+а не по одной записи на событие. Сводка: python telemetry_summary.py
+"""
+import os
+import json
+import time
+import uuid
+import atexit
+
+DEFAULT_PATH = "events.jsonl"
+
+# Сколько событий копить перед записью в файл
+FLUSH_EVERY = 64
+
+
+class EventLog:
+    """Буферизованный журнал событий в формате JSON Lines"""
+
+    def __init__(self, path=DEFAULT_PATH, flush_every=FLUSH_EVERY):
+        self.path = path
+        self.flush_every = flush_every
+        self.session_id = uuid.uuid4().hex[:12]
+        self._buffer = []
+        atexit.register(self.flush)
+
+    def record(self, event, **fields):
+        """Добавление события в буфер"""
+        self._buffer.append({"event": event, "ts": time.time(),
+                             "session": self.session_id, **fields})
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Запись накопленных событий одним добавлением в файл"""
+        if not self._buffer:
+            return
+        lines = "".join(json.dumps(fields, ensure_ascii=False) + "\n" for fields in self._buffer)
+        self._buffer = []
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+        except OSError as e:
+            print(f"Не удалось записать журнал событий: {e}")
+
+    def new_session(self):
+        """Новая игра - новый идентификатор сессии в событиях"""
+        self.session_id = uuid.uuid4().hex[:12]
+
+
+def read_events(path):
+    """Построчное чтение журнала событий"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
@@ -0,0 +1,85 @@
+"""Сводка времени ответов из журнала событий.
+
+Запуск: python telemetry_summary.py [events.jsonl] [--top 20]
+
+Печатает процентили времени (p50/p90/p99, мс) по уровням и по вопросам.
+"""
+import math
+import argparse
+from collections import defaultdict
+
+from question_bank import QuestionBank, QuestionBankError, question_key
+from telemetry import DEFAULT_PATH, read_events
+
+
+def percentile(sorted_values, fraction):
+    """Процентиль по отсортированному списку (ближайший ранг)"""
+    if not sorted_values:
+        return 0.0
+    index = math.ceil(fraction * len(sorted_values)) - 1
+    return sorted_values[max(0, index)]
+
+
+def row(name, latencies):
+    latencies.sort()
+    return (f"{name:<28} {len(latencies):>7} {percentile(latencies, 0.50):>9.0f} "
+            f"{percentile(latencies, 0.90):>9.0f} {percentile(latencies, 0.99):>9.0f}")
+
+
+HEADER = f"{'':<28} {'событий':>7} {'p50, мс':>9} {'p90, мс':>9} {'p99, мс':>9}"
+
+
+def question_texts(questions_dir):
+    """Тексты вопросов по ключам (если банк доступен)"""
+    bank = QuestionBank(questions_dir)
+    try:
+        bank.load()
+    except QuestionBankError:
+        return {}
+    return {question_key(q): q.question for q in bank.questions_for("all")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сводка времени ответов")
+    parser.add_argument("path", nargs="?", default=DEFAULT_PATH)
+    parser.add_argument("--top", type=int, default=20,
+                        help="сколько самых медленных вопросов показать")
+    parser.add_argument("--questions-dir", default="questions")
+    args = parser.parse_args()
+
+    by_level = defaultdict(list)
+    by_question = defaultdict(list)
+    question_levels = {}
+    for event in read_events(args.path):
+        latency = event.get("latency_ms")
+        if latency is None:
+            continue
+        by_level[(event.get("level"), event.get("event"))].append(latency)
+        # Время ответа на вопрос - это ответ, пропуск или истечение времени
+        if event.get("event") != "hint":
+            by_question[event.get("question")].append(latency)
+            question_levels[event.get("question")] = event.get("difficulty")
+
+    if not by_level:
+        print(f"В журнале {args.path} нет событий")
+        return
+
+    print("По уровням:")
+    print(HEADER)
+    for (level, kind), latencies in sorted(by_level.items(), key=lambda item: (str(item[0][0]), str(item[0][1]))):
+        print(row(f"{level} / {kind}", latencies))
+
+    texts = question_texts(args.questions_dir)
+    slowest = sorted(by_question.items(),
+                     key=lambda item: percentile(sorted(item[1]), 0.90), reverse=True)
+    print()
+    print(f"Самые медленные вопросы (по p90), всего вопросов: {len(by_question)}:")
+    print(HEADER)
+    for key, latencies in slowest[:args.top]:
+        print(row(f"{key} ({question_levels.get(key)})", latencies))
+        if key in texts:
+            print(f"    {texts[key][:70]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+import json
+
+import pytest
+
+from import_questions import (ValidationError, MANIFEST_FILE, main, normalize_text,
+                              read_manifest, text_hash, validate_record)
+
+
+def record(**fields):
+    base = {"question": "Столица Франции?", "options": ["Берлин", "Париж", "Рим"],
+            "answer": 1, "category": "География", "difficulty": "easy"}
+    base.update(fields)
+    return base
+
+
+def test_valid_record_is_normalized():
+    item = validate_record(record(question="  Столица Франции?  ", options=[" Берлин", "Париж "]))
+    assert item == {"question": "Столица Франции?", "options": ["Берлин", "Париж"], "answer": 1,
+                    "category": "География", "difficulty": "easy"}
+
+
+def test_csv_option_columns():
+    row = {"question": "2+2?", "option1": "три", "option2": "четыре", "option3": "",
+           "option4": "", "answer": "четыре", "category": "Математика", "difficulty": "простой"}
+    item = validate_record(row)
+    assert item["options"] == ["три", "четыре"]
+    assert item["answer"] == 1
+    assert item["difficulty"] == "easy"
+
+
+@pytest.mark.parametrize("answer, index", [(2, 2), (" 2 ", 2), ("c", 2), ("C", 2), ("Рим", 2)])
+def test_answer_forms(answer, index):
+    # "2" не совпадает ни с одним вариантом, поэтому это номер
+    assert validate_record(record(answer=answer))["answer"] == index
+
+
+@pytest.mark.parametrize("options, answer, index", [
+    (["10", "20", "30"], "20", 1),
+    (["0", "1", "2"], "1", 1),
+    (["1", "2", "3", "4"], 2, 2),
+    (["A", "B"], "B", 1),
+    (["1", "2", "3", "4"], "4", 3),
+])
+def test_answer_matching_option_text(options, answer, index):
+    assert validate_record(record(options=options, answer=answer))["answer"] == index
+
+
+@pytest.mark.parametrize("options, answer", [(["1", "2", "3", "4"], "2"), (["B", "A"], "A")])
+def test_ambiguous_answer_is_rejected(options, answer):
+    with pytest.raises(ValidationError, match="неоднозначен"):
+        validate_record(record(options=options, answer=answer))
+
+
+def test_defaults():
+    item = validate_record(record(category=None, difficulty=""))
+    assert item["difficulty"] == "medium"
+    assert item["category"] == "Общие знания"
+
+
+@pytest.mark.parametrize("fields, message", [
+    ({"question": " "}, "пустой вопрос"),
+    ({"options": ["один"], "answer": 0}, "вариантов 1"),
+    ({"options": ["a", "b", "c", "d", "e"]}, "вариантов 5"),
+    ({"options": ["a", "a"]}, "повторяющиеся"),
+    ({"options": "a|b", "answer": 5}, "вне вариантов"),
+    ({"answer": "Лондон"}, "не найден"),
+    ({"answer": True}, "нет ответа"),
+    ({"answer": None}, "нет ответа"),
+    ({"difficulty": "impossible"}, "неизвестная сложность"),
+    ({"category": "Кулинария"}, "неизвестная категория"),
+    ({"options": {"a": 1}}, "списком"),
+])
+def test_invalid_records(fields, message):
+    with pytest.raises(ValidationError, match=message):
+        validate_record(record(**fields))
+
+
+def test_record_must_be_object():
+    with pytest.raises(ValidationError):
+        validate_record(["вопрос"])
+
+
+def test_any_category():
+    assert validate_record(record(category="Кулинария"), categories=None)["category"] == "Кулинария"
+
+
+def test_duplicates_ignore_case_and_punctuation():
+    assert normalize_text("  Ёлка — это ЧТО?! ") == "елка это что"
+    assert text_hash("Ёлка — это что?") == text_hash("елка, это что")
+
+
+def write_jsonl(path, items):
+    path.write_text("".join(json.dumps(item, ensure_ascii=False) + "\n" for item in items),
+                    encoding='utf-8')
+
+
+def run_import(tmp_path, items, *extra):
+    source = tmp_path / "in.jsonl"
+    write_jsonl(source, items)
+    main(["import", str(source), "--output", str(tmp_path / "questions"),
+          "--processes", "1", *extra])
+
+
+def test_import_skips_existing_questions_and_replaces_own_files(tmp_path, capsys):
+    questions = tmp_path / "questions"
+    questions.mkdir()
+    (questions / "easy_questions.json").write_text(
+        json.dumps([record()], ensure_ascii=False), encoding='utf-8')
+
+    run_import(tmp_path, [record(question="Столица Франции"), record(question="Столица Италии?")])
+    assert "дубликатов: 1," in capsys.readouterr().out
+    assert read_manifest(questions) == {"imported": ["imported_easy_0001.json"]}
+
+    run_import(tmp_path, [record(question="Столица Испании?", difficulty="hard")])
+    assert read_manifest(questions) == {"imported": ["imported_hard_0001.json"]}
+    assert sorted(p.name for p in questions.glob("*.json")) == [
+        "easy_questions.json", "imported_hard_0001.json"]
+
+
+def test_import_refuses_prefix_of_foreign_files(tmp_path):
+    questions = tmp_path / "questions"
+    questions.mkdir()
+    (questions / "easy_questions.json").write_text("[]", encoding='utf-8')
+    with pytest.raises(SystemExit):
+        run_import(tmp_path, [record()], "--prefix", "easy")
+    assert [p.name for p in questions.iterdir()] == ["easy_questions.json"]
+    assert not (questions / MANIFEST_FILE).exists()
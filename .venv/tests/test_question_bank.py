@@ -0,0 +1,242 @@
+import io
+import os
+import json
+import sys
+import struct
+
+import pytest
+
+from question_bank import (CACHE_FILE, CACHE_MAGIC, BankFile, Question, QuestionBank,
+                           QuestionColumns, read_cache, write_cache)
+
+
+QUESTIONS = [
+    {"question": "Столица Франции?", "options": ["Берлин", "Париж", "Рим"], "answer": 1,
+     "category": "География", "difficulty": "easy"},
+    {"question": "Пустой вариант?", "options": ["", "да"], "answer": 1,
+     "category": "Разное", "difficulty": "easy"},
+    {"question": "2 + 2 × 2?", "options": ["8", "6", "4", "2"], "answer": 1,
+     "category": "Математика", "difficulty": "hard"},
+    {"question": "Год основания Москвы?", "options": ["1147", "1240"], "answer": 0,
+     "difficulty": "medium"},
+]
+
+
+def as_tuples(questions):
+    return [(q.question, q.options, q.answer, q.category, q.difficulty) for q in questions]
+
+
+@pytest.fixture
+def questions_dir(tmp_path):
+    (tmp_path / "test.json").write_text(json.dumps(QUESTIONS, ensure_ascii=False),
+                                        encoding='utf-8')
+    return tmp_path
+
+
+def load(questions_dir):
+    bank = QuestionBank(str(questions_dir))
+    bank.load()
+    return bank
+
+
+def cache_bytes(questions_dir):
+    return (questions_dir / CACHE_FILE).read_bytes()
+
+
+def rewrite_header(data, change):
+    """Кэш с измененным заголовком и теми же колонками"""
+    start = len(CACHE_MAGIC) + 4
+    size, = struct.unpack("<I", data[len(CACHE_MAGIC):start])
+    header = json.loads(data[start:start + size])
+    change(header)
+    raw = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    raw += b" " * (-(start + len(raw)) % 8)
+    return CACHE_MAGIC + struct.pack("<I", len(raw)) + raw + data[start + size:]
+
+
+def test_round_trip_through_cache(questions_dir):
+    parsed = load(questions_dir)
+    cached = load(questions_dir)
+    entry = cached.files["test.json"]
+    assert all(isinstance(items, QuestionColumns) for items in entry.levels.values())
+    assert as_tuples(cached.questions_for("all")) == as_tuples(parsed.questions_for("all"))
+    assert cached.count("easy") == 2 and cached.count() == 4
+    assert cached.questions_for("medium")[0].category == "Test"
+
+
+def test_write_and_read_cache_in_memory():
+    questions = [Question(f"Вопрос {i}?", [f"a{i}", "б", ""], i % 3, f"К{i % 2}", "easy")
+                 for i in range(50)]
+    out = io.BytesIO()
+    write_cache(out, {"f.json": BankFile.from_questions(1, 2, "digest", questions)})
+    files = read_cache(out.getvalue())
+    entry = files["f.json"]
+    assert (entry.mtime_ns, entry.size, entry.digest) == (1, 2, "digest")
+    columns = entry.levels["easy"]
+    # По одному вопросу и все сразу собираются одинаково
+    assert as_tuples([columns[7], columns[-1]]) == as_tuples([questions[7], questions[-1]])
+    assert as_tuples(columns) == as_tuples(questions)
+    assert columns[7] is columns.materialize()[7]
+
+
+def test_category_index_matches_questions():
+    questions = [Question(f"Вопрос {i}?", ["а", "б"], 0, f"К{i % 3}", "easy") for i in range(30)]
+    out = io.BytesIO()
+    write_cache(out, {"f.json": BankFile.from_questions(1, 2, "digest", questions)})
+    for entry in (BankFile.from_questions(1, 2, "digest", questions),
+                  read_cache(out.getvalue())["f.json"]):
+        assert entry.category_names() == {"К0", "К1", "К2"}
+        for name in ("К0", "К1", "К2"):
+            assert as_tuples(entry.in_category(name)) == as_tuples(
+                [q for q in questions if q.category == name])
+        assert entry.in_category("Нет такой") == []
+
+
+def test_bank_categories(questions_dir):
+    load(questions_dir)
+    bank = load(questions_dir)
+    assert bank.categories() == ["Test", "География", "Математика", "Разное"]
+    assert [q.question for q in bank.questions_in_category("Разное")] == ["Пустой вариант?"]
+
+
+def test_files_that_cannot_be_cached_are_skipped():
+    bad = Question("Вопрос?", ["a", "b"], "b", "К", "easy")
+    out = io.BytesIO()
+    write_cache(out, {"bad.json": BankFile.from_questions(1, 2, "d", [bad])})
+    assert read_cache(out.getvalue()) == {}
+
+
+def set_categories(value):
+    def change(header):
+        header["files"]["test.json"]["levels"]["easy"]["categories"] = value
+    return change
+
+
+def set_category_ends(value):
+    def change(header):
+        header["files"]["test.json"]["levels"]["easy"]["category_ends"] = value
+    return change
+
+
+def shift_column(name, delta):
+    def change(header):
+        header["files"]["test.json"]["levels"]["easy"]["columns"][name][0] += delta
+    return change
+
+
+@pytest.mark.parametrize("change", [
+    set_categories([]),
+    set_categories([1, 2]),
+    shift_column("first", 4),
+    shift_column("ends", 4),
+    shift_column("text", 10 ** 9),
+    set_category_ends([1, 0]),
+    set_category_ends([1]),
+    set_category_ends([0, 5]),
+])
+def test_corrupt_cache_is_rejected(questions_dir, change):
+    load(questions_dir)
+    data = rewrite_header(cache_bytes(questions_dir), change)
+    with pytest.raises((ValueError, TypeError, KeyError)):
+        read_cache(data)
+
+
+@pytest.mark.parametrize("column, value", [("cats", 2), ("first", 100), ("ends", 0)])
+def test_corrupt_column_values_are_rejected(questions_dir, column, value):
+    load(questions_dir)
+    data = bytearray(cache_bytes(questions_dir))
+    start = len(CACHE_MAGIC) + 4
+    size, = struct.unpack("<I", data[len(CACHE_MAGIC):start])
+    header = json.loads(data[start:start + size])
+    offset, length = header["files"]["test.json"]["levels"]["easy"]["columns"][column]
+    itemsize = {"cats": 2, "first": 4, "ends": 4}[column]
+    position = start + size + offset + length - itemsize
+    data[position:position + itemsize] = value.to_bytes(itemsize, sys.byteorder)
+    with pytest.raises(ValueError):
+        read_cache(bytes(data))
+
+
+def test_corrupt_cache_falls_back_to_json_and_is_rewritten(questions_dir):
+    expected = as_tuples(load(questions_dir).questions_for("all"))
+    cache = questions_dir / CACHE_FILE
+    cache.write_bytes(rewrite_header(cache.read_bytes(), set_categories([])))
+
+    bank = load(questions_dir)
+    assert as_tuples(bank.questions_for("all")) == expected
+    # Испорченный кэш заменен новым
+    assert read_cache(cache.read_bytes())["test.json"].digest == bank.files["test.json"].digest
+
+
+@pytest.mark.parametrize("content", [b"", b"garbage", CACHE_MAGIC + b"\xff\xff\xff\x7f{"])
+def test_unreadable_cache_is_ignored(questions_dir, content):
+    expected = as_tuples(load(questions_dir).questions_for("all"))
+    (questions_dir / CACHE_FILE).write_bytes(content)
+    assert as_tuples(load(questions_dir).questions_for("all")) == expected
+
+
+def write_questions(questions_dir, questions, name="test.json"):
+    (questions_dir / name).write_text(json.dumps(questions, ensure_ascii=False), encoding='utf-8')
+
+
+def test_reload_edited_file_patches_indexes(questions_dir):
+    bank = load(questions_dir)
+    write_questions(questions_dir, QUESTIONS[:2] + [dict(QUESTIONS[2], difficulty="easy")])
+    assert bank.reload_file("test.json")
+    assert bank.count("easy") == 3 and bank.count("hard") == 0 and bank.count("medium") == 0
+    assert bank.count() == 3
+    assert [q.question for q in bank.questions_for("easy")][-1] == "2 + 2 × 2?"
+    assert bank.questions_for("hard") == []
+
+
+def test_reload_new_file_adds_it(questions_dir):
+    bank = load(questions_dir)
+    write_questions(questions_dir, [QUESTIONS[2]], "more.json")
+    assert bank.reload_file("more.json")
+    assert bank.count("hard") == 2 and bank.count() == 5
+
+
+def test_reload_with_same_content_changes_nothing(questions_dir):
+    bank = load(questions_dir)
+    before = bank.by_difficulty["easy"]["test.json"]
+    stat = (questions_dir / "test.json").stat()
+    os.utime(questions_dir / "test.json", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert not bank.reload_file("test.json")
+    assert bank.by_difficulty["easy"]["test.json"] is before
+    assert bank.files["test.json"].mtime_ns == stat.st_mtime_ns + 10 ** 9
+
+
+def test_reload_broken_json_keeps_old_questions(questions_dir):
+    bank = load(questions_dir)
+    expected = as_tuples(bank.questions_for("all"))
+    (questions_dir / "test.json").write_text('[{"question": ', encoding='utf-8')
+    assert not bank.reload_file("test.json")
+    assert as_tuples(bank.questions_for("all")) == expected
+    assert bank.count() == 4
+
+
+def test_reload_deleted_file_removes_its_questions(questions_dir):
+    bank = load(questions_dir)
+    write_questions(questions_dir, [QUESTIONS[2]], "more.json")
+    bank.reload_file("more.json")
+    (questions_dir / "test.json").unlink()
+    assert bank.reload_file("test.json")
+    assert list(bank.files) == ["more.json"]
+    assert bank.count() == 1 and bank.count("easy") == 0
+    assert not bank.remove_file("test.json")
+
+
+def test_watcher_reloads_changed_files(questions_dir):
+    pytest.importorskip("PyQt5")
+    from bank_watcher import BankWatcher
+    bank = load(questions_dir)
+    watcher = BankWatcher(bank)
+    changed = []
+    watcher.changed.connect(changed.append)
+
+    write_questions(questions_dir, [QUESTIONS[2]], "more.json")
+    watcher._directory_changed(str(questions_dir))
+    (questions_dir / "test.json").write_text('[', encoding='utf-8')
+    watcher._file_changed(str(questions_dir / "test.json"))
+    watcher._reload_pending()
+    assert changed == ["more.json"]
+    assert bank.count() == 5
@@ -0,0 +1,143 @@
+import random
+
+import pytest
+
+from question_bank import Question
+from question_selector import (FenwickTree, MIN_SEEN_BITS, PlayerProfile,
+                               QuestionRatings, QuestionSelector, question_rating, text_crc)
+
+
+def make_questions(count, difficulty="medium", prefix="Вопрос"):
+    return [Question(f"{prefix} {i}?", ["a", "b", "c"], 0, "Тест", difficulty)
+            for i in range(count)]
+
+
+@pytest.mark.parametrize("values", [[1], [0, 1], [1, 1, 1, 1, 1], [3, 0, 2, 0, 0, 5, 1], [1] * 33])
+def test_fenwick_find_matches_linear_scan(values):
+    tree = FenwickTree(values)
+    for value in range(sum(values)):
+        running = 0
+        for index, item in enumerate(values):
+            running += item
+            if running > value:
+                break
+        assert tree.find(value) == index
+
+
+def test_fenwick_add_and_prefix():
+    rng = random.Random(3)
+    values = [rng.randrange(3) for _ in range(100)]
+    tree = FenwickTree(values)
+    for _ in range(200):
+        index = rng.randrange(len(values))
+        delta = rng.choice((-1, 1)) if values[index] else 1
+        values[index] += delta
+        tree.add(index, delta)
+        end = rng.randrange(len(values) + 1)
+        assert tree.prefix(end) == sum(values[:end])
+    assert tree.prefix(len(values)) == sum(values)
+
+
+def test_seen_map_keeps_marks_when_doubled():
+    player = PlayerProfile("тест")
+    questions = make_questions(500)
+    for question in questions[::3]:
+        player.mark_seen(question)
+    assert len(player.seen) * 8 == MIN_SEEN_BITS
+
+    player.ensure_capacity(100000)
+    assert len(player.seen) * 8 >= 100000 * 16
+    assert len(player.seen) & (len(player.seen) - 1) == 0
+    assert all(player.is_seen(q) for q in questions[::3])
+    flags = player.unseen_flags(text_crc(q) for q in questions)
+    assert not any(flags[::3])
+
+
+def test_profile_round_trip(tmp_path):
+    player = PlayerProfile("Вася Пупкин", players_dir=str(tmp_path))
+    player.rating = 1612.5
+    player.answered = 7
+    player.ensure_capacity(1000)
+    questions = make_questions(10)
+    player.mark_seen(questions[4])
+    player.save()
+
+    loaded = PlayerProfile.load("Вася Пупкин", players_dir=str(tmp_path))
+    assert (loaded.rating, loaded.answered, loaded.seen) == (1612.5, 7, player.seen)
+    assert loaded.is_seen(questions[4])
+
+
+def test_no_repeats_until_pool_is_exhausted():
+    questions = make_questions(30, "easy")
+    selector = QuestionSelector(questions, PlayerProfile(), rng=random.Random(5))
+    drawn = [selector.next_question() for _ in range(30)]
+    assert len({q.question for q in drawn}) == 30
+    # Новый круг начинается с полного пула
+    again = [selector.next_question() for _ in range(30)]
+    assert len({q.question for q in again}) == 30
+
+
+def test_same_text_is_drawn_once():
+    questions = make_questions(3, "easy")
+    questions.append(Question("Вопрос 1?", ["x", "y"], 1, "Другая", "easy"))
+    selector = QuestionSelector(questions, PlayerProfile(), rng=random.Random(1))
+    assert selector.size == 3
+    assert sorted(selector.next_question().question for _ in range(3)) == [
+        "Вопрос 0?", "Вопрос 1?", "Вопрос 2?"]
+
+
+def test_answers_move_question_and_player_ratings():
+    question = make_questions(1, "hard")[0]
+    player = PlayerProfile()
+    ratings = QuestionRatings()
+    selector = QuestionSelector([question], player, ratings=ratings)
+    start = question_rating(question)
+
+    selector.record(question, correct=True)
+    assert player.rating > 1500
+    assert ratings.rating(question) < start
+    assert player.answered == 1
+
+    before = ratings.rating(question)
+    selector.record(question, correct=False)
+    assert ratings.rating(question) > before
+
+
+def test_single_level_pool_is_banded_by_question_rating():
+    questions = make_questions(40, "medium")
+    ratings = QuestionRatings()
+    for question in questions[:10]:
+        ratings.ratings[text_crc(question)] = 1100
+    for question in questions[10:20]:
+        ratings.ratings[text_crc(question)] = 1900
+    selector = QuestionSelector(questions, PlayerProfile(), ratings=ratings)
+    assert [(rating, end - start) for rating, start, end in selector.bands] == [
+        (1100, 10), (1500, 20), (1900, 10)]
+
+
+def test_draws_prefer_questions_near_target():
+    # Игрок 1500: у вопросов 1350 ожидаемая вероятность ответа ~0.7
+    questions = make_questions(200, "medium")
+    ratings = QuestionRatings()
+    near = {q.question for q in questions[:100]}
+    for question in questions[:100]:
+        ratings.ratings[text_crc(question)] = 1350
+    for question in questions[100:]:
+        ratings.ratings[text_crc(question)] = 2200
+    selector = QuestionSelector(questions, PlayerProfile(), rng=random.Random(2),
+                                ratings=ratings)
+    drawn = [selector.next_question().question for _ in range(50)]
+    assert sum(text in near for text in drawn) >= 45
+
+
+def test_ratings_round_trip(tmp_path):
+    questions = make_questions(5)
+    ratings = QuestionRatings(str(tmp_path))
+    ratings.record(questions[0], 0.5, True)
+    ratings.record(questions[1], 0.5, False)
+    ratings.save()
+
+    loaded = QuestionRatings.load(str(tmp_path))
+    assert loaded.ratings == ratings.ratings
+    assert loaded.rating(questions[0]) == 1500 - 8
+    assert loaded.rating(questions[2]) == 1500
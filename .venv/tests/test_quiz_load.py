@@ -0,0 +1,38 @@
+import asyncio
+import argparse
+import json
+import random
+
+from question_bank import QuestionBank
+from quiz_server import QuizServer, MAX_LINE
+from quiz_load import LoadStats, play
+
+
+def test_timeouts_before_replies_are_skipped(tmp_path, monkeypatch):
+    # Время на ответ меньше раздумья: timeout приходит раньше ответа на hint и answer
+    monkeypatch.setattr("quiz_session.TIME_LIMITS", {"easy": 0.01, "all": 0.01})
+    questions = [{"question": f"Вопрос {i}?", "options": ["a", "b", "c", "d"], "answer": i % 4,
+                  "category": "Тест", "difficulty": "easy"} for i in range(5)]
+    (tmp_path / "test.json").write_text(json.dumps(questions, ensure_ascii=False), encoding='utf-8')
+    bank = QuestionBank(str(tmp_path))
+    bank.load()
+
+    async def run():
+        server = QuizServer(bank, game_length=3, rng=random.Random(1))
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0, limit=MAX_LINE)
+        args = argparse.Namespace(host="127.0.0.1", port=listener.sockets[0].getsockname()[1],
+                                  level="easy", questions=3, hint_rate=1.0, skip_rate=0.0,
+                                  think=0.02)
+        stats = LoadStats(4)
+        try:
+            await play(args, stats, random.Random(2))
+        finally:
+            listener.close()
+            await listener.wait_closed()
+        return stats
+
+    stats = asyncio.run(run())
+    assert stats.finished == 4
+    assert stats.errors == 0
+    assert stats.timeouts + stats.answers == 12
+    assert stats.timeouts > 0
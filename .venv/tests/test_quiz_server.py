@@ -0,0 +1,122 @@
+import json
+import random
+import asyncio
+
+import pytest
+
+from question_bank import QuestionBank
+from quiz_server import QuizServer, MAX_LINE
+
+
+@pytest.fixture
+def bank(tmp_path):
+    questions = [{"question": f"Вопрос {i}?", "options": ["a", "b", "c", "d"], "answer": i % 4,
+                  "category": "Тест", "difficulty": difficulty}
+                 for i, difficulty in enumerate(["easy", "easy", "easy", "medium"])]
+    (tmp_path / "test.json").write_text(json.dumps(questions, ensure_ascii=False), encoding='utf-8')
+    bank = QuestionBank(str(tmp_path))
+    bank.load()
+    return bank
+
+
+def talk(bank, *messages):
+    """Ответы сервера на запросы одного подключения (по строке на запрос)"""
+    async def run():
+        server = QuizServer(bank, game_length=2, rng=random.Random(1))
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0, limit=MAX_LINE)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=2 * MAX_LINE)
+        replies = []
+        try:
+            for message in messages:
+                if not isinstance(message, bytes):
+                    message = json.dumps(message, ensure_ascii=False).encode('utf-8') + b"\n"
+                writer.write(message)
+                await writer.drain()
+                line = await reader.readline()
+                replies.append(json.loads(line) if line else None)
+        finally:
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+        return replies
+    return asyncio.run(run())
+
+
+def error_of(reply):
+    assert reply["event"] == "error"
+    return reply["error"]
+
+
+def test_full_game(bank):
+    levels, question, result, nxt, result2, finished = talk(
+        bank, {"cmd": "levels"}, {"cmd": "start", "level": "easy"}, {"cmd": "answer", "option": 0},
+        {"cmd": "next"}, {"cmd": "skip"}, {"cmd": "next"})
+    assert levels["levels"]["easy"] == 3 and levels["levels"]["hard"] == 0
+    assert question["event"] == "question" and question["total"] == 2 and question["hints"]
+    assert result["event"] == "result" and "correct" in result
+    assert nxt["event"] == "question" and nxt["index"] == 1
+    assert result2["skipped"]
+    assert finished["event"] == "finished" and finished["grade"] in ("game_over", "lost", "poor",
+                                                                      "satisfactory", "good",
+                                                                      "excellent")
+
+
+@pytest.mark.parametrize("line, message", [
+    (b"{oops\n", "некорректный JSON"),
+    (b"[1, 2]\n", "объектом"),
+    (b'{"cmd": "dance"}\n', "неизвестная команда"),
+    (b'{"cmd": "answer", "option": 0}\n', "игра не начата"),
+    (b'{"cmd": "next"}\n', "игра не начата"),
+    (b'{"cmd": "start", "level": "expert"}\n', "неизвестный уровень"),
+    (b'{"cmd": "start", "level": "hard"}\n', "нет вопросов"),
+    (b'{"cmd": "start", "questions": true}\n', "questions"),
+    (b'{"cmd": "start", "questions": -1}\n', "questions"),
+    (b'{"cmd": "start", "questions": "5"}\n', "questions"),
+])
+def test_request_errors(bank, line, message):
+    assert message in error_of(talk(bank, line)[0])
+
+
+@pytest.mark.parametrize("option", [4, -1, True, "1", None])
+def test_bad_option(bank, option):
+    reply = talk(bank, {"cmd": "start", "level": "easy"}, {"cmd": "answer", "option": option})[1]
+    assert "option" in error_of(reply)
+
+
+def test_question_state_errors(bank):
+    replies = talk(bank, {"cmd": "start", "level": "easy"}, {"cmd": "next"},
+                   {"cmd": "answer", "option": 1}, {"cmd": "answer", "option": 1},
+                   {"cmd": "skip"}, {"cmd": "hint"})
+    assert "сначала ответьте" in error_of(replies[1])
+    assert replies[2]["event"] == "result"
+    for reply in replies[3:]:
+        assert "уже ответили" in error_of(reply)
+
+
+def test_hints(bank):
+    replies = talk(bank, {"cmd": "start", "level": "easy"}, {"cmd": "hint"}, {"cmd": "hint"})
+    assert replies[1]["event"] == "hint" and len(replies[1]["removed"]) == 2
+    assert "уже использована" in error_of(replies[2])
+    reply = talk(bank, {"cmd": "start", "level": "medium"}, {"cmd": "hint"})[1]
+    assert "только на простом" in error_of(reply)
+
+
+def test_finished_game_rejects_moves(bank):
+    replies = talk(bank, {"cmd": "start", "level": "medium"}, {"cmd": "skip"}, {"cmd": "next"},
+                   {"cmd": "answer", "option": 0}, {"cmd": "next"})
+    assert replies[2]["event"] == "finished"
+    assert "завершена" in error_of(replies[3])
+    assert "завершена" in error_of(replies[4])
+
+
+def test_errors_keep_connection_open(bank):
+    replies = talk(bank, b"{oops\n", {"cmd": "levels"})
+    assert replies[1]["event"] == "levels"
+
+
+def test_too_long_line_closes_connection(bank):
+    replies = talk(bank, b'{"cmd": "levels", "pad": "' + b"x" * (MAX_LINE + 10) + b'"}\n',
+                   {"cmd": "levels"})
+    assert "длинная" in error_of(replies[0])
+    assert replies[1] is None
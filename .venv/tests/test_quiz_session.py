@@ -0,0 +1,151 @@
+import random
+
+import pytest
+
+from question_bank import Question
+from quiz_session import QuizSession, HINT_REMOVES, grade_for
+
+
+def make_questions(*difficulties):
+    return [Question(f"Вопрос {i}?", ["a", "b", "c", "d"], i % 4, "Тест", difficulty)
+            for i, difficulty in enumerate(difficulties)]
+
+
+def make_session(difficulty="all", *question_difficulties):
+    questions = make_questions(*(question_difficulties or ("easy", "medium", "hard")))
+    return QuizSession(questions, difficulty, rng=random.Random(1))
+
+
+def wrong(session):
+    return (session.question.answer + 1) % len(session.question.options)
+
+
+def test_points_depend_on_question_difficulty():
+    session = make_session("all", "easy", "medium", "hard")
+    gained = []
+    while not session.finished:
+        gained.append(session.answer(session.question.answer))
+        session.advance()
+    assert gained == [1, 2, 3]
+    assert session.score == 6
+    assert session.correct_answers == 3
+
+
+def test_second_answer_is_ignored():
+    session = make_session("easy", "easy")
+    assert session.answer(session.question.answer) == 1
+    assert session.answer(session.question.answer) is None
+    assert session.score == 1
+
+
+def test_wrong_answer_costs_nothing_below_hard():
+    session = make_session("medium", "medium")
+    assert session.answer(wrong(session)) == 0
+    assert session.score == 0
+
+
+def test_hard_penalty_for_wrong_answer_and_skip():
+    session = make_session("hard", "hard", "hard", "hard")
+    session.answer(session.question.answer)
+    session.advance()
+    assert session.score == 3
+    assert session.answer(wrong(session)) == -1
+    session.advance()
+    assert session.skip() == -1
+    assert session.score == 1
+
+
+def test_hard_penalty_never_goes_below_zero():
+    session = make_session("hard", "hard", "hard")
+    assert session.answer(wrong(session)) == 0
+    session.advance()
+    assert session.skip() == 0
+    assert session.score == 0
+
+
+@pytest.mark.parametrize("difficulty", ["medium", "hard", "all"])
+def test_hints_only_on_easy(difficulty):
+    session = make_session(difficulty, "easy")
+    assert not session.hints_allowed
+    assert session.hint() == []
+
+
+def test_hint_removes_wrong_options_once():
+    session = make_session("easy", "easy")
+    removed = session.hint()
+    assert len(removed) == HINT_REMOVES
+    assert session.question.answer not in removed
+    assert len(set(removed)) == len(removed)
+    assert session.hint() == []
+
+
+def test_no_hint_after_answer():
+    session = make_session("easy", "easy")
+    session.answer(session.question.answer)
+    assert session.hint() == []
+
+
+def test_time_out_skips_without_penalty():
+    session = make_session("hard", "hard", "hard")
+    session.answer(session.question.answer)
+    session.advance()
+    session.time_out()
+    assert session.resolved
+    assert session.skipped == 1
+    assert session.score == 3
+
+
+def test_skip_is_penalized_but_time_out_is_not():
+    skipped = make_session("hard", "hard", "hard")
+    timed_out = make_session("hard", "hard", "hard")
+    for session in (skipped, timed_out):
+        session.answer(session.question.answer)
+        session.advance()
+    skipped.skip()
+    timed_out.time_out()
+    assert skipped.score == 2
+    assert timed_out.score == 3
+    assert skipped.skipped == timed_out.skipped == 1
+
+
+def test_percentage_counts_only_passed_questions():
+    session = make_session("all", "easy", "hard", "medium")
+    assert session.percentage() == 0
+    session.answer(session.question.answer)
+    session.advance()
+    session.skip()
+    session.advance()
+    # Пройдены easy (1 очко) и hard (3 очка), набрано 1 из 4
+    assert session.max_possible_score() == 4
+    assert session.percentage() == 25
+
+
+def test_advance_reports_end_of_game():
+    session = make_session("easy", "easy", "easy")
+    session.answer(session.question.answer)
+    assert session.advance()
+    session.skip()
+    assert not session.advance()
+    assert session.finished
+
+
+def test_reset_starts_over():
+    session = make_session("easy", "easy", "easy")
+    session.answer(session.question.answer)
+    session.advance()
+    session.hint()
+    session.reset()
+    assert (session.current, session.score, session.correct_answers, session.skipped) == (0, 0, 0, 0)
+    assert not session.hint_used and not session.resolved
+    assert sorted(q.question for q in session.questions) == ["Вопрос 0?", "Вопрос 1?"]
+
+
+def test_grades():
+    session = make_session("easy", "easy", "easy")
+    assert grade_for(session) == "game_over"
+    session.skip()
+    session.advance()
+    assert grade_for(session) == "lost"
+    session.answer(session.question.answer)
+    session.advance()
+    assert grade_for(session) == "satisfactory"
@@ -0,0 +1,58 @@
+import random
+
+from question_bank import Question
+from quiz_session import QuizSession, POINTS, TIME_LIMITS, HARD_PENALTY
+from simulate import play_player
+
+
+class TrackedList(list):
+    """Список, запоминающий, к каким позициям обращались"""
+
+    def __init__(self, items):
+        super().__init__(items)
+        self.touched = set()
+
+    def __getitem__(self, index):
+        self.touched.add(index)
+        return super().__getitem__(index)
+
+    def __setitem__(self, index, value):
+        self.touched.add(index)
+        super().__setitem__(index, value)
+
+
+def make_config(max_questions, **overrides):
+    config = {"level": "easy", "accuracy": 0.7, "accuracy_spread": 0.0, "hint_rate": 0.5,
+              "timeout_rate": 0.1, "skip_rate": 0.1, "response_time": 0.0,
+              "time_limits": dict(TIME_LIMITS), "points": dict(POINTS),
+              "penalty": HARD_PENALTY, "max_questions": max_questions}
+    config.update(overrides)
+    return config
+
+
+def make_questions(count):
+    return [Question(f"Вопрос {i}?", ["a", "b", "c", "d"], i % 4, "Тест", "easy")
+            for i in range(count)]
+
+
+def test_game_touches_only_max_questions():
+    questions = TrackedList(make_questions(10000))
+    rng = random.Random(5)
+    session = QuizSession(make_questions(1), "easy", rng=rng)
+    config = make_config(10)
+    for _ in range(20):
+        questions.touched.clear()
+        play_player(session, questions, rng, config)
+        assert session.current == 10
+        assert len(questions.touched) == 10
+
+
+def test_whole_level_is_played_when_max_questions_covers_it():
+    questions = make_questions(7)
+    rng = random.Random(3)
+    session = QuizSession(questions, "easy", rng=rng)
+    play_player(session, questions, rng, make_config(7, timeout_rate=0.0, skip_rate=0.0,
+                                                     accuracy=1.0))
+    assert session.current == 7
+    assert session.correct_answers == 7
+    assert [q.question for q in questions] == [f"Вопрос {i}?" for i in range(7)]
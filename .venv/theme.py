@@ -0,0 +1,273 @@
+"""Общая таблица стилей приложения.
+
+Стили разбираются Qt один раз при установке на QApplication. Состояния
+виджетов (правильный/неправильный ответ, предупреждение таймера, цвет
+уровня и т.д.) переключаются динамическими свойствами через set_state,
+без повторной сборки таблицы стилей.
+"""
+
+# Сколько раз виджеты перерисовывали стиль (см. measure_repolish.py)
+repolish_count = 0
+
+OPTION_COLORS = ("#3498db", "#2ecc71", "#e74c3c", "#9b59b6")
+
+OPTION_BASE = """
+    color: white;
+    font-size: 16px;
+    border: none;
+    border-radius: 10px;
+    padding: 15px;
+    text-align: left;
+    padding-left: 30px;
+"""
+
+LABEL_PILL = """
+    font-size: 16px;
+    font-weight: bold;
+    color: #2c3e50;
+    padding: 8px 15px;
+    border-radius: 15px;
+"""
+
+APP_STYLESHEET = f"""
+/* Окно выбора уровня сложности */
+QDialog#difficultyDialog {{
+    background-color: #2c3e50;
+}}
+QDialog#difficultyDialog QLabel {{
+    color: white;
+    font-size: 18px;
+}}
+QLabel#titleLabel {{
+    color: #3498db;
+    font-size: 36px;
+    font-weight: bold;
+}}
+QLabel#subtitleLabel {{
+    color: #ecf0f1;
+    font-size: 20px;
+}}
+QDialog#difficultyDialog QLabel[role="description"] {{
+    color: #bdc3c7;
+    font-size: 14px;
+    padding: 5px;
+}}
+QPushButton[role="level"] {{
+    color: white;
+    font-size: 18px;
+    font-weight: bold;
+    border: none;
+    border-radius: 10px;
+    padding: 15px;
+    text-align: left;
+    padding-left: 30px;
+}}
+QPushButton[role="level"]:hover {{
+    border: 3px solid white;
+}}
+QPushButton[role="level"][level="easy"] {{ background-color: #2ecc71; }}
+QPushButton[role="level"][level="easy"]:hover {{ background-color: #27ae60; }}
+QPushButton[role="level"][level="medium"] {{ background-color: #f39c12; }}
+QPushButton[role="level"][level="medium"]:hover {{ background-color: #e67e22; }}
+QPushButton[role="level"][level="hard"] {{ background-color: #e74c3c; }}
+QPushButton[role="level"][level="hard"]:hover {{ background-color: #c0392b; }}
+QPushButton#allLevelsButton {{
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+        stop:0 #9b59b6, stop:0.5 #3498db, stop:1 #2ecc71);
+    color: white;
+    font-size: 16px;
+    font-weight: bold;
+    border: none;
+    border-radius: 10px;
+    padding: 15px;
+}}
+QPushButton#allLevelsButton:hover {{
+    border: 3px solid white;
+}}
+
+/* Верхняя панель */
+QLabel#difficultyLabel {{
+    font-size: 14px;
+    font-weight: bold;
+    padding: 8px 15px;
+    border-radius: 15px;
+    color: #3498db;
+    background-color: #ebf5fb;
+}}
+QLabel#difficultyLabel[difficulty="easy"] {{ color: #27ae60; background-color: #d5f4e6; }}
+QLabel#difficultyLabel[difficulty="medium"] {{ color: #e67e22; background-color: #fdebd0; }}
+QLabel#difficultyLabel[difficulty="hard"] {{ color: #c0392b; background-color: #fadbd8; }}
+QLabel#difficultyLabel[difficulty="all"] {{ color: #9b59b6; background-color: #ebdef0; }}
+
+QLabel#timerLabel {{
+    {LABEL_PILL}
+    background-color: #ecf0f1;
+    border: 2px solid #3498db;
+}}
+QLabel#timerLabel[level="warning"] {{
+    color: white;
+    background-color: #f39c12;
+    border: 2px solid #e67e22;
+}}
+QLabel#timerLabel[level="critical"] {{
+    color: white;
+    background-color: #e74c3c;
+    border: 2px solid #c0392b;
+}}
+
+QLabel#scoreLabel {{
+    {LABEL_PILL}
+    background-color: #fffacd;
+    border: 2px solid #f39c12;
+}}
+QLabel#scoreLabel[state="gain"] {{
+    background-color: #d5f4e6;
+    border: 2px solid #27ae60;
+}}
+QLabel#scoreLabel[state="loss"] {{
+    background-color: #fadbd8;
+    border: 2px solid #e74c3c;
+}}
+
+/* Прогресс */
+QLabel#progressLabel {{
+    font-size: 14px;
+    color: #7f8c8d;
+}}
+QLabel#skippedLabel {{
+    font-size: 14px;
+    color: #e74c3c;
+}}
+QProgressBar#progressBar {{
+    border: 2px solid #3498db;
+    border-radius: 5px;
+    text-align: center;
+    height: 20px;
+}}
+QProgressBar#progressBar::chunk {{
+    background-color: #3498db;
+    border-radius: 3px;
+}}
+
+/* Вопрос */
+QLabel#questionDifficultyLabel {{
+    font-size: 14px;
+    font-weight: bold;
+    border-radius: 5px;
+    padding: 3px;
+    color: #f39c12;
+    background-color: #fadbd8;
+}}
+QLabel#questionDifficultyLabel[difficulty="easy"] {{ color: #27ae60; background-color: #d5f4e6; }}
+QLabel#questionDifficultyLabel[difficulty="medium"] {{ color: #f39c12; background-color: #fdebd0; }}
+QLabel#questionDifficultyLabel[difficulty="hard"] {{ color: #e74c3c; background-color: #fadbd8; }}
+
+QLabel#categoryLabel {{
+    font-size: 16px;
+    font-weight: bold;
+    color: #3498db;
+    padding: 10px;
+    background-color: #ebf5fb;
+    border-radius: 8px;
+    border: 1px solid #3498db;
+}}
+QLabel#questionLabel {{
+    font-size: 22px;
+    font-weight: bold;
+    color: #2c3e50;
+    padding: 25px;
+    background-color: #f8f9fa;
+    border-radius: 15px;
+    border: 3px solid #dfe6e9;
+    margin: 10px;
+}}
+
+/* Варианты ответов */
+QPushButton[role="option"] {{
+    {OPTION_BASE}
+    background-color: #bdc3c7;
+}}
+QPushButton[role="option"][state="neutral"][slot="0"] {{ background-color: {OPTION_COLORS[0]}; }}
+QPushButton[role="option"][state="neutral"][slot="1"] {{ background-color: {OPTION_COLORS[1]}; }}
+QPushButton[role="option"][state="neutral"][slot="2"] {{ background-color: {OPTION_COLORS[2]}; }}
+QPushButton[role="option"][state="neutral"][slot="3"] {{ background-color: {OPTION_COLORS[3]}; }}
+QPushButton[role="option"][state="neutral"]:hover {{
+    border: 3px solid white;
+    font-weight: bold;
+}}
+QPushButton[role="option"][state="neutral"]:disabled {{
+    background-color: #bdc3c7;
+}}
+QPushButton[role="option"][state="correct"] {{
+    background-color: #2ecc71;
+    border: 3px solid #27ae60;
+    font-weight: bold;
+}}
+QPushButton[role="option"][state="wrong"] {{
+    background-color: #e74c3c;
+    border: 3px solid #c0392b;
+    font-weight: bold;
+}}
+QPushButton[role="option"][state="revealed"] {{
+    background-color: #f39c12;
+    border: 3px solid #e67e22;
+    font-weight: bold;
+}}
+QPushButton[role="option"][state="dimmed"] {{
+    background-color: #bdc3c7;
+}}
+QPushButton[role="option"][state="hinted"] {{
+    background-color: #95a5a6;
+}}
+
+/* Нижняя панель */
+QPushButton#hintButton, QPushButton#skipButton, QPushButton#nextButton {{
+    font-size: 14px;
+    padding: 10px;
+    color: white;
+    border: none;
+    border-radius: 8px;
+}}
+QPushButton#hintButton {{ background-color: #f39c12; }}
+QPushButton#hintButton:hover {{ background-color: #e67e22; }}
+QPushButton#skipButton {{ background-color: #95a5a6; }}
+QPushButton#skipButton:hover {{ background-color: #7f8c8d; }}
+QPushButton#nextButton {{
+    font-weight: bold;
+    padding: 10px 20px;
+    background-color: #2ecc71;
+}}
+QPushButton#nextButton:hover {{ background-color: #27ae60; }}
+QPushButton#hintButton:disabled, QPushButton#skipButton:disabled, QPushButton#nextButton:disabled {{
+    background-color: #bdc3c7;
+}}
+QPushButton#changeDifficultyButton {{
+    font-size: 14px;
+    padding: 8px;
+    background-color: #9b59b6;
+    color: white;
+    border: none;
+    border-radius: 5px;
+}}
+QPushButton#changeDifficultyButton:hover {{
+    background-color: #8e44ad;
+}}
+"""
+
+
+def apply(app):
+    """Установка общей таблицы стилей (разбирается Qt один раз)"""
+    if app.styleSheet() != APP_STYLESHEET:
+        app.setStyleSheet(APP_STYLESHEET)
+
+
+def set_state(widget, name, value):
+    """Переключение состояния виджета с перерисовкой только при изменении"""
+    global repolish_count
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    repolish_count += 1